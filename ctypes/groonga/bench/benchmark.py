@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+"""Benchmark binding operations against temporary database."""
+
+import json
+import platform
+import resource
+import statistics
+import sys
+import time
+from argparse import Namespace
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from shutil import rmtree
+from tempfile import mkdtemp
+from typing import Any, cast
+
+from ctypes_groonga import (
+    Context,
+    Groonga,
+    Table,
+)
+from ctypes_groonga.table import (
+    create_table,
+    list_tables,
+)
+
+_load_batch_sizes = [1, 100, 1000, 10000]
+_select_result_sizes = [10, 100, 1000, 10000]
+_table_counts = [10, 100, 500]
+_clear_record_counts = [1000, 10000]
+
+
+class Runner:
+    """Benchmark runner."""
+
+    def __init__(self, groonga: Groonga, repeat: int, pattern: str | None) -> None:
+        """Initialize."""
+        self.groonga = groonga
+        self.repeat = repeat
+        self.pattern = pattern
+        self.results: list[dict[str, Any]] = []
+
+    @contextmanager
+    def database(self) -> Iterator[Context]:
+        """Create temporary database."""
+        base = Path(mkdtemp())
+        try:
+            with self.groonga.create_ctx(base / "bench.db") as c:
+                yield c
+        finally:
+            rmtree(base)
+
+    def measure(
+        self,
+        name: str,
+        func: Callable[[], object],
+        setup: Callable[[], object] | None = None,
+        repeat: int | None = None,
+        items: int = 1,
+    ) -> None:
+        """Measure latency of function.
+
+        `setup` is called before each call and is not measured.
+        `items` is the number of records processed by one call.
+        """
+        if self.pattern is not None and self.pattern not in name:
+            return
+
+        base_rss = _reset_peak_rss()
+        latencies = []
+        for _ in range(repeat or self.repeat):
+            if setup is not None:
+                setup()
+
+            start = time.perf_counter_ns()
+            func()
+            latencies.append(time.perf_counter_ns() - start)
+
+        result = _summarize(name, latencies, items, _peak_rss() - base_rss)
+        self.results.append(result)
+        _print_result(result)
+
+
+def bench_send_recv(runner: Runner) -> None:
+    """Measure round trip of command."""
+    with runner.database() as c:
+
+        def status() -> None:
+            c.send("status")
+            c.recv()
+
+        def status_raw() -> None:
+            c.send("status")
+            c.recv_raw()
+
+        runner.measure("send_recv", status, repeat=runner.repeat * 50)
+        runner.measure("send_recv_raw", status_raw, repeat=runner.repeat * 50)
+
+
+def bench_load(runner: Runner) -> None:
+    """Measure load by batch size."""
+    with runner.database() as c:
+        t = _create_table(c)
+        start = 0
+        for size in _load_batch_sizes:
+
+            def load(size: int = size) -> None:
+                nonlocal start
+                t.load(values=_records(start, size))
+                start += size
+
+            runner.measure(f"load_{size}", load, items=size)
+
+
+def bench_select(runner: Runner) -> None:
+    """Measure select by result size."""
+    with runner.database() as c:
+        t = _create_table(c)
+        t.load(values=_records(0, max(_select_result_sizes)))
+        for size in _select_result_sizes:
+
+            def select(size: int = size) -> None:
+                t.select(limit=size)
+
+            runner.measure(f"select_{size}", select, items=size)
+
+
+def bench_list_tables(runner: Runner) -> None:
+    """Measure list_tables by number of tables."""
+    with runner.database() as c:
+        created = 0
+        for count in _table_counts:
+            for i in range(created, count):
+                _create_table(c, f"Table{i}")
+            created = count
+
+            def invalidate() -> None:
+                # Force the catalog to reload as after a schema change.
+                c.schema_version += 1
+
+            runner.measure(f"list_tables_{count}", lambda: list_tables(c), items=count)
+            runner.measure(
+                f"list_tables_{count}_cold",
+                lambda: list_tables(c),
+                setup=invalidate,
+                items=count,
+            )
+
+
+def bench_clear(runner: Runner) -> None:
+    """Measure clear by number of records."""
+    with runner.database() as c:
+        t = _create_table(c)
+        for count in _clear_record_counts:
+
+            def fill(records: str = json.dumps(_records(0, count))) -> None:
+                t.load(values=records)
+
+            runner.measure(f"clear_{count}", t.clear, setup=fill, items=count)
+
+
+_benchmarks: list[Callable[[Runner], None]] = [
+    bench_send_recv,
+    bench_load,
+    bench_select,
+    bench_list_tables,
+    bench_clear,
+]
+
+
+def _compare(results: list[dict[str, Any]], base_path: Path) -> None:
+    base = {r["name"]: r for r in json.loads(base_path.read_text())["results"]}
+    print(f"\n{'name':<24} {'base ops/s':>12} {'ops/s':>12} {'ratio':>8}")
+    for result in results:
+        b = base.get(result["name"])
+        if b is None:
+            continue
+        ops, base_ops = result["ops_per_sec"], b["ops_per_sec"]
+        print(f"{result['name']:<24} {base_ops:>12.1f} {ops:>12.1f} {ops / base_ops:>7.2f}x")
+
+
+def _create_table(ctx: Context, name: str = "Bench") -> Table:
+    t = create_table(ctx, name=name, flags="TABLE_HASH_KEY", key_type="ShortText")
+    t.create_column(name="title", type="ShortText")
+    t.create_column(name="size", type="UInt32")
+    return t
+
+
+def _peak_rss() -> int:
+    # Linux reports kilobytes and macOS reports bytes.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform != "darwin" else rss // 1024
+
+
+def _print_result(result: dict[str, Any]) -> None:
+    print(
+        f"{result['name']:<24} "
+        f"{result['ops_per_sec']:>12.1f} ops/s "
+        f"p50 {result['p50_us']:>10.1f} us "
+        f"p99 {result['p99_us']:>10.1f} us "
+        f"rss +{result['rss_growth_kib']:>8} KiB"
+    )
+    sys.stdout.flush()
+
+
+def _records(start: int, size: int) -> list[dict[str, Any]]:
+    return [
+        {"_key": f"key{i}", "title": f"title {i}", "size": i} for i in range(start, start + size)
+    ]
+
+
+def _reset_peak_rss() -> int:
+    # Linux can reset the peak to the current RSS, so growth is measured per case.
+    # Elsewhere growth is measured above the peak of the preceding cases.
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass
+    return _peak_rss()
+
+
+def _summarize(name: str, latencies: list[int], items: int, rss_growth: int) -> dict[str, Any]:
+    total = sum(latencies) / 1e9
+    if 1 < len(latencies):
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p99 = quantiles[49], quantiles[98]
+    else:
+        p50 = p99 = latencies[0]
+
+    return {
+        "name": name,
+        "ops": len(latencies),
+        "items_per_op": items,
+        "ops_per_sec": len(latencies) / total,
+        "items_per_sec": len(latencies) * items / total,
+        "p50_us": p50 / 1000,
+        "p99_us": p99 / 1000,
+        # Growth of the peak RSS while the case runs.
+        "rss_growth_kib": rss_growth,
+    }
+
+
+def _main(args: Namespace) -> int:
+    lib = cast(str | None, args.lib)
+    with Groonga(None if lib is None else Path(lib)) as g:
+        runner = Runner(g, args.repeat, args.pattern)
+        for bench in _benchmarks:
+            bench(runner)
+
+        report = {
+            "python": platform.python_version(),
+            "groonga": g.version,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "timestamp": time.time(),
+            "results": runner.results,
+        }
+
+    if args.json is not None:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+    if args.compare is not None:
+        _compare(runner.results, Path(args.compare))
+
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser()
+    parser.add_argument("--lib", help="specify the groonga library path")
+    parser.add_argument("--repeat", type=int, default=20, help="specify the number of calls")
+    parser.add_argument("--pattern", help="run only benchmarks whose name contains pattern")
+    parser.add_argument("--json", help="write results to JSON file")
+    parser.add_argument("--compare", help="compare with results of JSON file")
+
+    args = parser.parse_args()
+    sys.exit(_main(args))
@@ -1,68 +1,156 @@
 #!/usr/bin/env python
 """Index and query text."""
 
+import hashlib
+import json
 import os
 import sys
 from argparse import Namespace
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import cast
+from typing import Any, cast
 
 from ctypes_groonga import (
     Context,
     Groonga,
+    Pipeline,
     Table,
 )
 from ctypes_groonga.table import (
-    create_table,
     list_tables,
 )
 
 
-def _index_source(path: Path, directory: Path) -> int:
+def _index_source(path: Path, directory: Path, jobs: int = 1, incremental: bool = False) -> int:
 
-    def index_content(table: Table, path: Path, i: int, line: str) -> int:
-        content = line.rstrip("\n")
-        if len(content.strip()) == 0:
-            return 0
+    def walk() -> Iterator[Path]:
+        for parent, dirs, files in os.walk(directory):
+            for file in files:
+                source = Path(parent) / file
+                if source.suffix == ".py":
+                    yield source
 
-        data = {
-            "path": str(path),
-            "line": i,
-            "content": content,
+    def open_ctx(g: Groonga) -> Context:
+        if incremental and path.exists():
+            return g.open_ctx(path)
+        return g.create_ctx(path)
+
+    with Groonga() as g:
+        with open_ctx(g) as c:
+            tables = {
+                t.name: t  # type: ignore[attr-defined]
+                for t in list_tables(c)
+            }
+            missing = {name for name in ("Source", "Manifest") if name not in tables}
+            if missing:
+                with c.pipeline() as p:
+                    if "Source" in missing:
+                        _setup_table(p)
+                    if "Manifest" in missing:
+                        _setup_manifest(p)
+
+                tables = {
+                    t.name: t  # type: ignore[attr-defined]
+                    for t in list_tables(c)
+                }
+
+            table = tables["Source"]
+            manifest = tables["Manifest"]
+
+            if missing == {"Manifest"}:
+                # Files indexed without manifest are unknown, so index all files again.
+                table.truncate()
+
+            sources, entries = _update_manifest(table, manifest, list(walk()))
+
+            with table.bulk_loader() as loader:
+                if jobs <= 1:
+                    for records in map(_read_source, sources):
+                        for record in records:
+                            loader.add_raw(record)
+                else:
+                    # Read files in parallel and load them in this process.
+                    with ProcessPoolExecutor(max_workers=jobs) as executor:
+                        for records in executor.map(_read_source, sources, chunksize=16):
+                            for record in records:
+                                loader.add_raw(record)
+
+            # Record manifest after loading to retry interrupted files at next time.
+            if entries:
+                manifest.load(values=entries)
+
+            return loader.loaded
+
+
+def _update_manifest(
+    table: Table, manifest: Table, files: list[Path]
+) -> tuple[list[Path], list[dict[str, Any]]]:
+    _, records = manifest.select(output_columns="_key,size,mtime,hash")
+    known = {r.key: r for r in records}  # type: ignore[attr-defined]
+    indexed = table.count != 0
+
+    sources = []
+    entries = []
+    for file in files:
+        key = str(file)
+        stat = file.stat()
+        entry: dict[str, Any] = {
+            "_key": key,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
         }
 
-        return table.load(
-            values=[
-                data,
-            ]
-        )
+        old = known.pop(key, None)
+        if (
+            old is not None
+            and old.size == stat.st_size  # type: ignore[attr-defined]
+            and old.mtime == stat.st_mtime  # type: ignore[attr-defined]
+        ):
+            continue
 
-    def scan_file(table: Table, path: Path) -> int:
-        if path.suffix != ".py":
-            return 0
+        with file.open("rb") as f:
+            entry["hash"] = hashlib.file_digest(f, "sha256").hexdigest()
 
-        ret = 0
-        with path.open() as f:
-            for i, line in enumerate(f, start=1):
-                ret += index_content(table, path, i, line)
+        entries.append(entry)
+        if old is not None and old.hash == entry["hash"]:  # type: ignore[attr-defined]
+            continue
 
-        return ret
+        # Records of new file may be left by interrupted run.
+        if indexed:
+            table.delete_where(filter=f"path == {_quote(key)}")
+        sources.append(file)
 
-    def walk(table: Table) -> int:
-        ret = 0
-        for parent, dirs, files in os.walk(directory):
-            for file in files:
-                ret += scan_file(table, Path(parent) / file)
+    # Remove files which do not exist.
+    for key in known:
+        table.delete_where(filter=f"path == {_quote(key)}")
+        manifest.delete(key=key)
 
-        return ret
+    return sources, entries
 
-    with Groonga() as g:
-        with g.create_ctx(path) as c:
-            table, _ = _setup_table(c)
-            return walk(table)
 
+def _read_source(path: Path) -> list[str]:
+    source = str(path)
 
-def _query_source(path: Path, query: str) -> int:
+    records = []
+    with path.open() as f:
+        for i, line in enumerate(f, start=1):
+            content = line.rstrip("\n")
+            if len(content.strip()) == 0:
+                continue
+
+            data = {
+                "path": source,
+                "line": i,
+                "content": content,
+            }
+
+            records.append(json.dumps(data))
+
+    return records
+
+
+def _query_source(path: Path, query: str, limit: int = -1) -> int:
     with Groonga() as g:
         with g.open_ctx(path) as c:
             tables = list_tables(c)
@@ -71,7 +159,12 @@ def _query_source(path: Path, query: str) -> int:
                 for t in tables
                 if t.name == "Source"  # type: ignore[attr-defined]
             ]
-            _, matches = table[0].select(match_columns="content", query=query)
+            _, matches = table[0].search(
+                query,
+                match_columns="content",
+                output_columns=["path", "line", "content"],
+                limit=limit,
+            )
 
             for match in matches:
                 print(f"{match.path}#L{match.line}:{match.content}")  # type: ignore[attr-defined]
@@ -80,28 +173,40 @@ def _query_source(path: Path, query: str) -> int:
             return len(matches)
 
 
-def _setup_table(ctx: Context) -> tuple[Table, Table]:
-    t = create_table(ctx, name="Source", flags="TABLE_NO_KEY")
-    t.create_column(name="path", type="ShortText")
-    t.create_column(name="line", type="UInt16")
-    t.create_column(name="content", type="ShortText")
+def _setup_manifest(pipeline: Pipeline) -> None:
+    pipeline.add("table_create", name="Manifest", flags="TABLE_HASH_KEY", key_type="ShortText")
+    pipeline.add("column_create", table="Manifest", name="size", type="UInt64")
+    pipeline.add("column_create", table="Manifest", name="mtime", type="Float")
+    pipeline.add("column_create", table="Manifest", name="hash", type="ShortText")
+
 
-    i = create_table(
-        ctx,
+def _setup_table(pipeline: Pipeline) -> None:
+    pipeline.add("table_create", name="Source", flags="TABLE_NO_KEY")
+    pipeline.add("column_create", table="Source", name="path", type="ShortText")
+    pipeline.add("column_create", table="Source", name="line", type="UInt16")
+    pipeline.add("column_create", table="Source", name="content", type="ShortText")
+
+    pipeline.add(
+        "table_create",
         name="Term",
         flags="TABLE_PAT_KEY",
         key_type="ShortText",
         default_tokenizer="TokenBigram",
         normalizer="NormalizerAuto",
     )
-    i.create_column(
+    pipeline.add(
+        "column_create",
+        table="Term",
         name="source_content",
         flags="COLUMN_INDEX|WITH_POSITION",
-        type=t.name,  # type: ignore[attr-defined]
+        type="Source",
         source="content",
     )
 
-    return t, i
+
+def _quote(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
 
 
 def _main(args: Namespace) -> int:
@@ -122,10 +227,13 @@ if __name__ == "__main__":
 
     index = subparser.add_parser("index")
     index.add_argument("directory", help="specify the directory")
+    index.add_argument("--jobs", type=int, default=1, help="specify the number of readers")
+    index.add_argument("--incremental", action="store_true", help="update only changed files")
     index.set_defaults(func=_index_source)
 
     query = subparser.add_parser("query")
     query.add_argument("query", help="specify the query")
+    query.add_argument("--limit", type=int, default=-1, help="specify the number of matches")
     query.set_defaults(func=_query_source)
 
     args = parser.parse_args()
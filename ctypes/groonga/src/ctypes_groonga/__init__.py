@@ -1,7 +1,17 @@
 """Groonga ctypes module."""
 
+from .cache import QueryCache as QueryCache
 from .column import Column as Column
 from .groonga import Context as Context
 from .groonga import Groonga as Groonga
+from .instrument import Instrumentation as Instrumentation
+from .loader import BulkLoader as BulkLoader
+from .pipeline import Pipeline as Pipeline
+from .pool import ContextPool as ContextPool
+from .prepared import PreparedCommand as PreparedCommand
+from .prepared import PreparedSelect as PreparedSelect
+from .querylog import QueryLogCollector as QueryLogCollector
 from .record import Record as Record
+from .resultset import ResultSet as ResultSet
+from .stream import SelectStream as SelectStream
 from .table import Table as Table
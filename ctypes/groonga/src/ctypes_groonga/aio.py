@@ -0,0 +1,118 @@
+"""asyncio module."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Self
+from weakref import WeakKeyDictionary
+
+from . import util
+from .pool import ContextPool
+from .table import Table
+
+if TYPE_CHECKING:
+    from .groonga import Context, Groonga
+    from .resultset import ResultSet, Row
+
+
+class AsyncContext:
+    """asyncio context backed by dedicated contexts.
+
+    A command is sent and received in one executor job. Even if the awaiting
+    task is cancelled, the job runs to the end and the context is returned
+    to the pool without unread response.
+    """
+
+    def __init__(self, groonga: Groonga, path: Path, size: int = 4, flags: int = 0) -> None:
+        """Initialize."""
+        self.pool = ContextPool(groonga, path, size, flags)
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="groonga")
+
+    async def __aenter__(self) -> Self:
+        """Enter context."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Exit context."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Wait running commands and close contexts."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+        self.pool.close()
+
+    async def execute(self, cmd: str) -> Any:  # noqa: ANN401
+        """Send command and receive data."""
+
+        def execute(ctx: Context) -> Any:  # noqa: ANN401
+            ctx.send(cmd)
+            return ctx.recv()
+
+        return await self.run(execute)
+
+    async def run[T](self, func: Callable[[Context], T]) -> T:
+        """Run function with borrowed context in executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, func)
+
+    def _call[T](self, func: Callable[[Context], T]) -> T:
+        with self.pool.acquire() as ctx:
+            return func(ctx)
+
+
+class AsyncTable:
+    """asyncio database table."""
+
+    def __init__(self, ctx: AsyncContext, name: str) -> None:
+        """Initialize."""
+        self.ctx = ctx
+        self.name = name
+        self._lock = threading.Lock()
+        self._tables: WeakKeyDictionary[Context, Table] = WeakKeyDictionary()
+
+    async def count(self) -> int:
+        """Count records."""
+        return await self.ctx.run(lambda c: self._table(c).count)
+
+    async def delete(self, **kwargs: Any) -> bool:  # noqa: ANN401
+        """Delete matching records."""
+        return await self.ctx.run(lambda c: self._table(c).delete(**kwargs))
+
+    async def load(self, **kwargs: Any) -> int:  # noqa: ANN401
+        """Insert records."""
+        return await self.ctx.run(lambda c: self._table(c).load(**kwargs))
+
+    async def select(self, **kwargs: Any) -> tuple[int, ResultSet]:  # noqa: ANN401
+        """Get matching records."""
+        return await self.ctx.run(lambda c: self._table(c).select(**kwargs))
+
+    async def iter_select(self, page_size: int = 1000, **kwargs: Any) -> AsyncIterator[Row]:  # noqa: ANN401
+        """Get matching records page by page."""
+        pages = util.Pages(page_size, int(kwargs.pop("offset", 0)), int(kwargs.pop("limit", -1)))
+        while not pages.done:
+            hits, records = await self.select(offset=pages.offset, limit=pages.size, **kwargs)
+            for record in records:
+                yield record
+            pages.advance(hits, len(records))
+
+    def _table(self, ctx: Context) -> Table:
+        with self._lock:
+            table = self._tables.get(ctx)
+
+        if table is None:
+            table = Table(ctx, name=self.name)
+            with self._lock:
+                self._tables[ctx] = table
+
+        return table
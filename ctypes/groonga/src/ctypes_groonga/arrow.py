@@ -0,0 +1,44 @@
+"""Apache Arrow result module."""
+
+import pyarrow as pa
+
+from .resultset import ResultSet
+
+# Apache Arrow IPC stream starts with continuation marker.
+_continuation = b"\xff\xff\xff\xff"
+
+_header_fields: set[str] = {
+    "return_code",
+    "start_time",
+    "elapsed_time",
+}
+
+
+def is_arrow(raw: bytes) -> bool:
+    """Check Apache Arrow IPC stream."""
+    return raw.startswith(_continuation)
+
+
+def read_table(raw: bytes) -> pa.Table:
+    """Read result set from Apache Arrow IPC streams without copy."""
+    reader = pa.BufferReader(pa.py_buffer(raw))
+
+    tables = []
+    while reader.tell() < reader.size():
+        with pa.ipc.open_stream(reader) as stream:
+            tables.append(stream.read_all())
+
+    for table in tables:
+        if not _header_fields & set(table.schema.names):
+            return table
+
+    return pa.table({})
+
+
+def from_records(records: ResultSet) -> pa.Table:
+    """Convert result set to Apache Arrow table."""
+    columns: list[list] = [[] for _ in records.keys]
+    if records.rows:
+        columns = [list(c) for c in zip(*records.rows, strict=True)]
+
+    return pa.table(dict(zip(records.keys, columns, strict=True)))
@@ -0,0 +1,147 @@
+"""Query cache module."""
+
+import re
+import time
+from collections import OrderedDict
+
+from . import util
+
+# Argument of command line which is quoted or delimited by spaces.
+_token_pattern = re.compile(rb"""'((?:[^'\\]|\\.)*)'|"((?:[^"\\]|\\.)*)"|(\S+)""", re.DOTALL)
+_unescape_pattern = re.compile(rb"\\(.)", re.DOTALL)
+
+_table_options: set[bytes] = {
+    b"--table",
+    b"--target_name",
+}
+
+
+class QueryCache:
+    """LRU cache of select responses.
+
+    Cached responses of a table are invalidated when records of the table
+    are changed, and all responses are invalidated when schema is changed
+    or when the changed table is not given by `--table` option.
+    Changes of tables referenced from output columns are not tracked.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float | None = None,
+    ) -> None:
+        """Initialize."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self._entries: OrderedDict[bytes, tuple[bytes, float | None, str | None]] = OrderedDict()
+        self._tables: dict[str | None, set[bytes]] = {}
+
+    def __len__(self) -> int:
+        """Count entries."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._tables.clear()
+        self.size = 0
+
+    def invalidate(self, table: str | None = None) -> None:
+        """Remove entries of table.
+
+        If `table` is None, remove all entries.
+        """
+        if table is None:
+            self.clear()
+            return
+
+        # Entries of unknown table may refer to the table.
+        for name in (table, None):
+            for key in self._tables.pop(name, set()):
+                self._remove(key)
+
+    def lookup(self, cmd: bytes) -> bytes | None:
+        """Get cached response of command.
+
+        If command changes database, invalidate affected entries.
+        """
+        name = util.command_name(cmd)
+        if name != b"select":
+            if name in util.write_commands:
+                self.invalidate(_table_name(cmd) or None)
+            elif name not in util.read_commands:
+                self.invalidate()
+            return None
+
+        entry = self._entries.get(cmd)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        response, expires, _ = entry
+        if expires is not None and expires <= time.monotonic():
+            self._remove(cmd)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(cmd)
+        self.hits += 1
+        return response
+
+    def store(self, cmd: bytes, response: bytes) -> None:
+        """Store response of command."""
+        if util.command_name(cmd) != b"select":
+            return
+
+        size = len(cmd) + len(response)
+        if self.max_bytes < size:
+            return
+
+        self._remove(cmd)
+
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        table = _table_name(cmd)
+        self._entries[cmd] = (response, expires, table)
+        self._tables.setdefault(table, set()).add(cmd)
+        self.size += size
+
+        while self.max_entries < len(self._entries) or self.max_bytes < self.size:
+            key = next(iter(self._entries))
+            self._remove(key)
+
+    def _remove(self, key: bytes) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        response, _, table = entry
+        self.size -= len(key) + len(response)
+
+        keys = self._tables.get(table)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tables[table]
+
+
+def _table_name(cmd: bytes) -> str | None:
+    """Get value of table option.
+
+    Quoted values are skipped so that option-like text in `--values` is not
+    taken. If table is not given by name, return None.
+    """
+    name = None
+    option = False
+    for m in _token_pattern.finditer(cmd):
+        plain = m.group(3)
+        if option:
+            value = plain if plain is not None else m.group(1) or m.group(2) or b""
+            name = _unescape_pattern.sub(rb"\1", value)
+        option = plain in _table_options
+
+    return None if not name else name.decode()
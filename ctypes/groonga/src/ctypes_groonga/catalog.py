@@ -0,0 +1,104 @@
+"""Schema catalog module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+
+from . import util
+
+if TYPE_CHECKING:
+    from .groonga import Context
+
+
+class Catalog:
+    """Schema catalog.
+
+    Catalog holds the attributes of `table_list` and `column_list`, which
+    are loaded once after schema is changed. It becomes stale when a command
+    which may change schema is sent, except the creation applied by `add_*`.
+    """
+
+    def __init__(self, ctx: Context) -> None:
+        """Initialize."""
+        self.ctx = ctx
+        self.version = -1
+        self._columns: dict[str, list[dict[str, Any]]] = {}
+        self._tables: dict[str, dict[str, Any]] = {}
+
+    @property
+    def stale(self) -> bool:
+        """Check catalog is not synchronized with database."""
+        return self.version != self.ctx.schema_version
+
+    def add_column(self, table: str, column: dict[str, Any]) -> None:
+        """Add column created by the last command."""
+        if not self._synchronized_before_last():
+            return
+
+        self._columns.setdefault(table, []).append(column)
+        self.version = self.ctx.schema_version
+
+    def add_table(self, table: dict[str, Any], columns: list[dict[str, Any]]) -> None:
+        """Add table created by the last command."""
+        if not self._synchronized_before_last():
+            return
+
+        self._tables[table["name"]] = table
+        self._columns[table["name"]] = list(columns)
+        self.version = self.ctx.schema_version
+
+    def clear(self) -> None:
+        """Synchronize catalog with database which has no tables."""
+        self._tables = {}
+        self._columns = {}
+        self.version = self.ctx.schema_version
+
+    def columns(self, table: str) -> list[dict[str, Any]] | None:
+        """Get columns of table if catalog is synchronized."""
+        if self.stale:
+            return None
+
+        return self._columns.get(table)
+
+    def refresh(self) -> None:
+        """Load catalog from database."""
+        version = self.ctx.schema_version
+
+        tables = list_tables(self.ctx)
+        self._tables = {t["name"]: t for t in tables}
+        self._columns = {t["name"]: list_columns(self.ctx, t["name"]) for t in tables}
+        self.version = version
+
+    def tables(self) -> list[dict[str, Any]]:
+        """Get tables."""
+        if self.stale:
+            self.refresh()
+
+        return list(self._tables.values())
+
+    def _synchronized_before_last(self) -> bool:
+        return self.version == self.ctx.schema_version - 1
+
+
+def list_columns(ctx: Context, table: str) -> list[dict[str, Any]]:
+    """Get attributes of columns by `column_list`."""
+    ctx.send(f"column_list --table {table}")
+    ret = cast(list, ctx.recv())
+
+    info = ret[0]
+    columns = ret[1:]
+
+    if not columns:
+        return []
+
+    keys = [i[0] for i in info]
+    return [c._asdict() for c in util.mknamedtuple("Column", keys, columns)]
+
+
+def list_tables(ctx: Context) -> list[dict[str, Any]]:
+    """Get attributes of tables by `table_list`."""
+    ctx.send("table_list")
+    ret = cast(list, ctx.recv())
+
+    keys = [i[0] for i in ret[0]]
+    return [t._asdict() for t in util.mknamedtuple("Table", keys, ret[1:])]
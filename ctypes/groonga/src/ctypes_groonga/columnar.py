@@ -0,0 +1,67 @@
+"""Columnar result module."""
+
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .resultset import ResultSet
+
+_dtypes: dict[str, type[np.generic]] = {
+    "Bool": np.bool_,
+    "Int8": np.int8,
+    "UInt8": np.uint8,
+    "Int16": np.int16,
+    "UInt16": np.uint16,
+    "Int32": np.int32,
+    "UInt32": np.uint32,
+    "Int64": np.int64,
+    "UInt64": np.uint64,
+    "Float32": np.float32,
+    "Float": np.float64,
+}
+
+_text_types: set[str] = {
+    "ShortText",
+    "Text",
+    "LongText",
+}
+
+
+def to_arrays(
+    records: ResultSet,
+    types: list[str | None],
+    fixed_width: bool = False,
+) -> dict[str, NDArray[Any]]:
+    """Convert rows to NumPy arrays by column type."""
+    count = len(records.rows)
+    columns: Iterable[tuple[Any, ...]] = zip(*records.rows, strict=True)
+    if count == 0:
+        columns = [() for _ in records.keys]
+
+    arrays = {}
+    for key, type_name, values in zip(records.keys, types, columns, strict=True):
+        arrays[key] = _to_array(values, type_name, count, fixed_width)
+
+    return arrays
+
+
+def _to_array(
+    values: tuple[Any, ...],
+    type_name: str | None,
+    count: int,
+    fixed_width: bool,
+) -> NDArray[Any]:
+    if type_name in _dtypes:
+        return np.fromiter(values, dtype=_dtypes[type_name], count=count)
+
+    if type_name == "Time":
+        # Time is output as seconds in float.
+        seconds = np.fromiter(values, dtype=np.float64, count=count)
+        return np.rint(seconds * 1_000_000).astype(np.int64).view("datetime64[us]")
+
+    if fixed_width and type_name in _text_types:
+        return np.array(values, dtype=np.str_)
+
+    return np.fromiter(values, dtype=object, count=count)
@@ -0,0 +1,97 @@
+"""pandas DataFrame loading module."""
+
+import json
+from collections.abc import Iterator
+from typing import Any
+
+import pandas as pd
+
+from . import error
+from .column import Column
+
+_integer_types: set[str] = {
+    "Int8",
+    "UInt8",
+    "Int16",
+    "UInt16",
+    "Int32",
+    "UInt32",
+    "Int64",
+    "UInt64",
+}
+
+_text_types: set[str] = {
+    "ShortText",
+    "Text",
+    "LongText",
+}
+
+# numpy dtype kinds which can be loaded to column type.
+_type_kinds: dict[str, str] = {
+    "Bool": "b",
+    "Float": "biuf",
+    "Float32": "biuf",
+    "Time": "iufM",
+} | dict.fromkeys(_integer_types, "biu")
+
+
+def chunks(data: Any, chunk_rows: int) -> Iterator[pd.DataFrame]:  # noqa: ANN401
+    """Split pandas DataFrame or Apache Arrow table into chunks."""
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), chunk_rows):
+            yield data.iloc[start : start + chunk_rows]
+    else:
+        for start in range(0, data.num_rows, chunk_rows):
+            yield data.slice(start, chunk_rows).to_pandas()
+
+
+def dtypes(data: Any) -> pd.Series:  # noqa: ANN401
+    """Get dtypes of pandas DataFrame or Apache Arrow table."""
+    if isinstance(data, pd.DataFrame):
+        return data.dtypes
+
+    empty: pd.DataFrame = data.slice(0, 0).to_pandas()
+    return empty.dtypes
+
+
+def encode(chunk: pd.DataFrame) -> str:
+    """Encode chunk to JSON array with column names at first."""
+    names = [str(n) for n in chunk.columns]
+    columns = [_to_list(chunk[n]) for n in chunk.columns]
+    return json.dumps([names, *zip(*columns, strict=True)])
+
+
+def validate(types: pd.Series, columns: list[Column]) -> None:
+    """Validate dtypes with column types."""
+    table_columns = {c.name: c for c in columns}  # type: ignore[attr-defined]
+
+    for name, dtype in types.items():
+        column = table_columns.get(str(name))
+        if column is None:
+            raise error.ColumnNotFoundError(name)
+
+        if "COLUMN_VECTOR" in column.flags:  # type: ignore[attr-defined]
+            kinds = "O"
+        elif column.range in _text_types:  # type: ignore[attr-defined]
+            kinds = "OSU"
+        else:
+            # reference column accepts key of referenced table.
+            kinds = _type_kinds.get(column.range, "biuOSU")  # type: ignore[attr-defined]
+
+        if dtype.kind not in kinds:
+            msg = f"{name}: {dtype} is not compatible with {column.range}"  # type: ignore[attr-defined]
+            raise error.ColumnTypeError(msg)
+
+
+def _to_list(series: pd.Series) -> list[Any]:
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+
+    if series.dtype.kind == "M":
+        # Time is loaded as seconds in float.
+        series = (series - pd.Timestamp(0)) / pd.Timedelta(seconds=1)
+
+    if series.hasnans:
+        return series.astype(object).where(series.notna(), None).tolist()
+
+    return series.tolist()
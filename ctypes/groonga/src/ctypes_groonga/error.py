@@ -23,3 +23,24 @@ class TableNotFoundError(NotFoundError):
     """Table not found error."""
 
     pass
+
+
+class ColumnTypeError(GroongaError):
+    """Column type error."""
+
+    pass
+
+
+class ResponseTooLargeError(GroongaError):
+    """Response too large error."""
+
+    pass
+
+
+class PipelineError(GroongaError):
+    """Pipeline error."""
+
+    def __init__(self, errors: list[tuple[int, str]]) -> None:
+        """Initialize."""
+        super().__init__("; ".join(f"#{i}: {msg}" for i, msg in errors))
+        self.errors = errors
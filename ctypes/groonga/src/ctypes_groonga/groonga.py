@@ -2,27 +2,34 @@
 
 from __future__ import annotations
 
+import codecs
 import json
+import time
 from collections.abc import Callable
 from ctypes import (
-    CDLL,
+    CFUNCTYPE,
     POINTER,
     Structure,
+    Union,
+    addressof,
     c_char,
     c_char_p,
     c_int,
     c_ubyte,
     c_uint,
+    c_ushort,
     c_void_p,
-    cdll,
     string_at,
 )
-from ctypes.util import find_library
 from pathlib import Path
 from types import TracebackType
-from typing import Any, Self, cast
+from typing import Any, Literal, Self, cast, overload
 
-from . import error
+from . import error, library, querylog, runtime, util
+from .cache import QueryCache
+from .catalog import Catalog
+from .instrument import Instrumentation, Sample
+from .pipeline import Pipeline
 
 
 class GrnCtx(Structure):
@@ -51,10 +58,161 @@ class GrnCtx(Structure):
     ]
 
 
-c_char_pp = POINTER(c_char_p)
+class GrnObjHeader(Structure):
+    """grn_obj_header."""
+
+    _fields_ = [
+        ("type", c_ubyte),
+        ("impl_flags", c_ubyte),
+        ("flags", c_ushort),
+        ("domain", c_uint),
+    ]
+
+
+class GrnBulk(Structure):
+    """Bulk member of grn_obj."""
+
+    _fields_ = [
+        ("head", c_void_p),
+        ("curr", c_void_p),
+        ("tail", c_void_p),
+    ]
+
+
+class GrnVector(Structure):
+    """Vector member of grn_obj."""
+
+    _fields_ = [
+        ("body", c_void_p),
+        ("sections", c_void_p),
+        ("n_sections", c_int),
+    ]
+
+
+class GrnObjBody(Union):
+    """Union of grn_obj."""
+
+    _fields_ = [
+        ("b", GrnBulk),
+        ("v", GrnVector),
+    ]
+
+
+class GrnObj(Structure):
+    """grn_obj."""
+
+    # https://groonga.org/docs/reference/api/grn_obj.html
+    _fields_ = [
+        ("header", GrnObjHeader),
+        ("u", GrnObjBody),
+    ]
+
+
+class GrnTableSortKey(Structure):
+    """grn_table_sort_key."""
+
+    _fields_ = [
+        ("key", c_void_p),
+        ("flags", c_uint),
+        ("offset", c_int),
+    ]
+
+
+grn_query_logger_log_func = CFUNCTYPE(
+    None, POINTER(GrnCtx), c_uint, c_char_p, c_char_p, c_char_p, c_void_p
+)
+grn_query_logger_func = CFUNCTYPE(None, POINTER(GrnCtx), c_void_p)
+
+
+class GrnQueryLogger(Structure):
+    """grn_query_logger."""
+
+    _fields_ = [
+        ("flags", c_uint),
+        ("user_data", c_void_p),
+        ("log", grn_query_logger_log_func),
+        ("reopen", grn_query_logger_func),
+        ("fin", grn_query_logger_func),
+    ]
+
+
+c_buf_p = POINTER(c_char)
+c_buf_pp = POINTER(c_buf_p)
 c_int_p = POINTER(c_int)
 c_uint_p = POINTER(c_uint)
 grn_ctx_p = POINTER(GrnCtx)
+grn_obj_p = POINTER(GrnObj)
+grn_table_sort_key_p = POINTER(GrnTableSortKey)
+
+# name: (restype, argtypes, errcheck)
+_prototypes: dict[str, library.Prototype] = {
+    "grn_bulk_write": (c_int, [grn_ctx_p, grn_obj_p, c_char_p, c_uint], None),
+    "grn_ctx_close": (c_int, [grn_ctx_p], library.check_grn_rc),
+    "grn_ctx_db": (c_void_p, [grn_ctx_p], library.check_grn_obj),
+    "grn_ctx_get": (c_void_p, [grn_ctx_p, c_char_p, c_int], None),
+    "grn_ctx_open": (grn_ctx_p, [c_int], library.check_grn_ctx),
+    "grn_ctx_recv": (c_uint, [grn_ctx_p, c_buf_pp, c_uint_p, c_int_p], None),
+    "grn_ctx_send": (c_uint, [grn_ctx_p, c_char_p, c_uint, c_int], None),
+    "grn_db_create": (c_void_p, [grn_ctx_p, c_char_p, c_void_p], library.check_grn_obj),
+    "grn_db_open": (c_void_p, [grn_ctx_p, c_char_p], library.check_grn_obj),
+    "grn_default_query_logger_set_flags": (None, [c_uint], None),
+    "grn_default_query_logger_set_path": (None, [c_char_p], None),
+    "grn_encoding_parse": (c_int, [c_char_p], None),
+    "grn_encoding_to_string": (c_char_p, [c_int], None),
+    "grn_expr_add_var": (c_void_p, [grn_ctx_p, c_void_p, c_char_p, c_uint], None),
+    "grn_expr_create": (c_void_p, [grn_ctx_p, c_char_p, c_uint], None),
+    "grn_expr_parse": (
+        c_int,
+        [grn_ctx_p, c_void_p, c_char_p, c_uint, c_void_p, c_int, c_int, c_int],
+        None,
+    ),
+    "grn_fin": (c_int, [], library.check_grn_rc),
+    "grn_get_default_encoding": (c_int, [], None),
+    "grn_get_version": (c_char_p, [], None),
+    "grn_init": (c_int, [], library.check_grn_rc),
+    "grn_obj_close": (c_int, [grn_ctx_p, grn_obj_p], None),
+    "grn_obj_column": (c_void_p, [grn_ctx_p, c_void_p, c_char_p, c_uint], None),
+    "grn_obj_get_range": (c_uint, [grn_ctx_p, c_void_p], None),
+    "grn_obj_get_value": (c_void_p, [grn_ctx_p, c_void_p, c_uint, grn_obj_p], None),
+    "grn_obj_id": (c_uint, [grn_ctx_p, c_void_p], None),
+    "grn_obj_set_value": (c_int, [grn_ctx_p, c_void_p, c_uint, grn_obj_p, c_int], None),
+    "grn_obj_unlink": (c_int, [grn_ctx_p, c_void_p], None),
+    "grn_query_logger_reopen": (None, [grn_ctx_p], None),
+    "grn_query_logger_set": (c_int, [grn_ctx_p, POINTER(GrnQueryLogger)], library.check_grn_rc),
+    "grn_set_default_encoding": (c_int, [c_int], library.check_grn_rc),
+    "grn_table_add": (c_uint, [grn_ctx_p, c_void_p, c_char_p, c_uint, c_int_p], None),
+    "grn_table_create": (
+        c_void_p,
+        [grn_ctx_p, c_char_p, c_uint, c_char_p, c_uint, c_void_p, c_void_p],
+        None,
+    ),
+    "grn_table_cursor_close": (c_int, [grn_ctx_p, c_void_p], None),
+    "grn_table_cursor_get_value": (c_int, [grn_ctx_p, c_void_p, POINTER(c_void_p)], None),
+    "grn_table_cursor_next": (c_uint, [grn_ctx_p, c_void_p], None),
+    "grn_table_cursor_open": (
+        c_void_p,
+        [grn_ctx_p, c_void_p, c_void_p, c_uint, c_void_p, c_uint, c_int, c_int, c_int],
+        None,
+    ),
+    "grn_table_select": (c_void_p, [grn_ctx_p, c_void_p, c_void_p, c_void_p, c_int], None),
+    "grn_table_size": (c_uint, [grn_ctx_p, c_void_p], None),
+    "grn_table_sort": (
+        c_int,
+        [grn_ctx_p, c_void_p, c_int, c_int, c_void_p, grn_table_sort_key_p, c_int],
+        None,
+    ),
+    "grn_vector_add_element": (
+        c_int,
+        [grn_ctx_p, grn_obj_p, c_char_p, c_uint, c_uint, c_uint],
+        None,
+    ),
+    "grn_vector_get_element": (
+        c_uint,
+        [grn_ctx_p, grn_obj_p, c_uint, POINTER(c_void_p), c_uint_p, c_uint_p],
+        None,
+    ),
+    "grn_vector_size": (c_uint, [grn_ctx_p, grn_obj_p], None),
+}
 
 
 class Groonga:
@@ -62,20 +220,10 @@ class Groonga:
 
     def __init__(self, path: Path | None = None) -> None:
         """Initialize."""
-        p = path
-        if p is None:
-            lib_path = find_library("groonga")
-            if isinstance(lib_path, str):
-                p = Path(lib_path)
-
-        if p is None:
-            raise error.NotFoundError("Not found groonga library.")
+        self._runtime: runtime.Runtime | None = runtime.acquire(path, _prototypes)
+        self._lib = self._runtime.lib
 
-        self._lib = cdll.LoadLibrary(str(p))
-        self._setup(self._lib)
-        self._lib.grn_init()
-
-    def __call__(self) -> CDLL:
+    def __call__(self) -> library.Library:
         """Get library."""
         return self._lib
 
@@ -113,15 +261,89 @@ class Groonga:
         return raw_version.decode(self.encoding)
 
     def fin(self) -> None:
-        """Dispose binding."""
-        self._lib.grn_fin()
+        """Dispose binding.
+
+        Library is finalized when no other instance in process uses it.
+        """
+        if self._runtime is None:
+            raise Exception("grn_fin() called twice")
+
+        runtime.release(self._runtime)
+        self._runtime = None
+
+    def set_query_log_path(
+        self,
+        path: Path | None,
+        flags: int = querylog.GRN_QUERY_LOG_DEFAULT,
+    ) -> None:
+        """Write query log to file by default query logger.
+
+        If `path` is None, query log is not written.
+        """
+        self._lib.grn_default_query_logger_set_flags(flags)
+        self._lib.grn_default_query_logger_set_path(None if path is None else bytes(path))
+
+        ctx = self._lib.grn_ctx_open(0)
+        try:
+            self._lib.grn_query_logger_reopen(ctx)
+        finally:
+            self._lib.grn_ctx_close(ctx)
+
+    def set_query_logger(
+        self,
+        callback: Callable[[str], None] | None,
+        flags: int = querylog.GRN_QUERY_LOG_DEFAULT,
+    ) -> None:
+        """Pass query log lines to callback instead of file.
+
+        Lines are the same format as query log file without newline.
+        If `callback` is None, restore default query logger.
+        """
+        if self._runtime is None:
+            raise Exception("grn_fin() already called")
+
+        logger = None
+        if callback is not None:
+            encoding = _python_codec(self.encoding)
+
+            def log(  # noqa: PLR0913, PLR0917
+                ctx: Any,  # noqa: ANN401
+                flag: int,
+                timestamp: bytes,
+                info: bytes,
+                message: bytes,
+                user_data: Any,  # noqa: ANN401
+            ) -> None:
+                line = timestamp + b"|" + info + message
+                callback(line.decode(encoding, "replace"))
+
+            logger = GrnQueryLogger(
+                flags,
+                None,
+                grn_query_logger_log_func(log),
+                grn_query_logger_func(),
+                grn_query_logger_func(),
+            )
+
+        ctx = self._lib.grn_ctx_open(0)
+        try:
+            self._lib.grn_query_logger_set(ctx, logger)
+        finally:
+            self._lib.grn_ctx_close(ctx)
+
+        # Logger and its callback must live while it is used by library,
+        # which may outlive this instance.
+        self._runtime.query_logger = logger
 
     def create_ctx(self, path: Path | None, flags: int = 0) -> Context:
         """Create new database."""
         raw_path = None if path is None else bytes(path)
         ctx = self._lib.grn_ctx_open(flags).contents
         self._lib.grn_db_create(ctx, raw_path, None)
-        return Context(self, ctx)
+
+        c = Context(self, ctx)
+        c.catalog.clear()
+        return c
 
     def open_ctx(self, path: Path, flags: int = 0) -> Context:
         """Open existing database."""
@@ -135,128 +357,6 @@ class Groonga:
         self._lib.grn_obj_unlink(ctx.ctx, db)
         self._lib.grn_ctx_close(ctx.ctx)
 
-    def _check_grn_ctx(self, name: str) -> Callable:
-        def check[T: Any](result: T, func: Callable, arguments: tuple[Any]) -> T:
-            func_name = name
-            if result is None or not bool(result):
-                raise Exception(f"{func_name}{arguments}")
-            return result
-
-        return check
-
-    def _check_grn_rc(self, name: str) -> Callable:
-        def check[T: Any](result: T, func: Callable, arguments: tuple[Any]) -> T:
-            func_name = name
-            if result != 0:
-                raise Exception(f"{func_name}{arguments}")
-            return result
-
-        return check
-
-    def _check_grn_obj(self, name: str) -> Callable:
-        def check[T: Any](result: T, func: Callable, arguments: tuple[Any]) -> T:
-            func_name = name
-            if result is None or not bool(result):
-                raise Exception(f"{func_name}{arguments}")
-            return result
-
-        return check
-
-    def _setup(self, lib: CDLL) -> None:
-        # grn_ctx_db
-        lib.grn_ctx_db.restype = c_void_p
-        lib.grn_ctx_db.argtypes = [
-            grn_ctx_p,
-        ]
-        lib.grn_ctx_db.errcheck = self._check_grn_obj("grn_ctx_db")
-
-        # grn_ctx_open
-        lib.grn_ctx_open.restype = grn_ctx_p
-        lib.grn_ctx_open.argtypes = [
-            c_int,
-        ]
-        lib.grn_ctx_open.errcheck = self._check_grn_ctx("grn_ctx_open")
-
-        # grn_ctx_recv
-        lib.grn_ctx_recv.restype = c_uint
-        lib.grn_ctx_recv.argtypes = [
-            grn_ctx_p,
-            c_char_pp,
-            c_uint_p,
-            c_int_p,
-        ]
-
-        # grn_ctx_send
-        lib.grn_ctx_send.restype = c_uint
-        lib.grn_ctx_send.argtypes = [
-            grn_ctx_p,
-            c_char_p,
-            c_uint,
-            c_int,
-        ]
-
-        # grn_ctx_close
-        lib.grn_ctx_close.restype = c_int
-        lib.grn_ctx_close.argtypes = [
-            grn_ctx_p,
-        ]
-        lib.grn_ctx_close.errcheck = self._check_grn_rc("grn_ctx_close")
-
-        # grn_db_create
-        lib.grn_db_create.restype = c_void_p
-        lib.grn_db_create.argtypes = [
-            grn_ctx_p,
-            c_char_p,
-            c_void_p,
-        ]
-        lib.grn_db_create.errcheck = self._check_grn_obj("grn_db_create")
-
-        # grn_db_open
-        lib.grn_db_open.restype = c_void_p
-        lib.grn_db_open.argtypes = [
-            grn_ctx_p,
-            c_char_p,
-        ]
-        lib.grn_db_open.errcheck = self._check_grn_obj("grn_db_open")
-
-        # grn_encoding_parse
-        lib.grn_encoding_parse.restype = c_int
-        lib.grn_encoding_parse.argtypes = [
-            c_char_p,
-        ]
-
-        # grn_encoding_to_string
-        lib.grn_encoding_to_string.restype = c_char_p
-        lib.grn_encoding_to_string.argtypes = [
-            c_int,
-        ]
-
-        # grn_fin
-        lib.grn_fin.restype = c_int
-        lib.grn_fin.argtypes = []
-        lib.grn_fin.errcheck = self._check_grn_rc("grn_fin")
-
-        # grn_get_default_encoding
-        lib.grn_get_default_encoding.restype = c_int
-        lib.grn_get_default_encoding.argtypes = []
-
-        # grn_get_version
-        lib.grn_get_version.restype = c_char_p
-        lib.grn_get_version.argtypes = []
-
-        # grn_init
-        lib.grn_init.restype = c_int
-        lib.grn_init.argtypes = []
-        lib.grn_init.errcheck = self._check_grn_rc("grn_init")
-
-        # grn_obj_unlink
-        lib.grn_obj_unlink.argtypes = [grn_ctx_p, c_void_p]
-
-        # grn_set_default_encoding
-        lib.grn_set_default_encoding.restype = c_int
-        lib.grn_set_default_encoding.argtypes = [c_int]
-        lib.grn_set_default_encoding.errcheck = self._check_grn_rc("grn_set_default_encoding")
-
 
 class Context:
     """grn_ctx wrapper."""
@@ -265,6 +365,19 @@ class Context:
         """Initialize."""
         self.groonga = groonga
         self.ctx = ctx
+        self._lib = groonga()
+
+        # The encoding of grn_ctx is fixed at open, so resolve the codec once.
+        raw_encoding: bytes = self._lib.grn_encoding_to_string(ctx.encoding)
+        self.encoding = _python_codec(raw_encoding.decode())
+        self._utf8 = codecs.lookup(self.encoding).name == "utf-8"
+
+        self.cache: QueryCache | None = None
+        self.catalog = Catalog(self)
+        self.instrumentation: Instrumentation | None = None
+        self.schema_version = 0
+        self._cache_key: bytes | None = None
+        self._cached: bytes | None = None
 
     def __enter__(self) -> Self:
         """Enter context."""
@@ -279,27 +392,156 @@ class Context:
         """Exit context."""
         self.groonga.close_ctx(self)
 
+    def enable_cache(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float | None = None,
+    ) -> QueryCache:
+        """Enable cache of select responses."""
+        self.cache = QueryCache(max_entries, max_bytes, ttl)
+        return self.cache
+
+    def enable_instrumentation(self) -> Instrumentation:
+        """Enable per command measurement."""
+        self.instrumentation = Instrumentation()
+        return self.instrumentation
+
+    def pipeline(self) -> Pipeline:
+        """Create group of commands."""
+        return Pipeline(self)
+
     def recv(self) -> bool | int | float | str | list | dict | None:
         """Receive data from database."""
-        data = c_char_p()
-        data_len = c_uint()
-        flags = c_int()
-        self.groonga().grn_ctx_recv(self.ctx, data, data_len, flags)
+        raw = cast(bytes, self._receive(copy=True))
+
+        inst = self.instrumentation
+        start = 0 if inst is None else time.perf_counter_ns()
+
+        value = None
+        if raw:
+            text = raw if self._utf8 else raw.decode(self.encoding)
+            value = cast(bool | int | float | str | list | dict, json.loads(text))
 
-        r = None
-        if data_len.value != 0:
-            raw = string_at(data)[0 : data_len.value]
-            r = raw.decode(self.groonga.encoding)
+        if inst is not None:
+            sample = inst.current()
+            if sample is not None:
+                sample.parse_ns = time.perf_counter_ns() - start
+            inst.end()
 
-        return None if r is None else json.loads(r)
+        return value
 
-    def send(self, data: str, flags: int = 0) -> int:
+    @overload
+    def recv_raw(self, copy: Literal[True] = True) -> bytes: ...
+
+    @overload
+    def recv_raw(self, copy: Literal[False]) -> memoryview: ...
+
+    def recv_raw(self, copy: bool = True) -> bytes | memoryview:
+        """Receive raw data from database.
+
+        If `copy` is false, return the view of the buffer owned by grn_ctx.
+        The view is valid until next `send`.
+        """
+        raw = self._receive(copy)
+        if self.instrumentation is not None:
+            self.instrumentation.end()
+        return raw
+
+    def send(self, data: str | bytes, flags: int = 0) -> int:
         """Send data to database."""
-        d = data.encode(self.groonga.encoding)
+        inst = self.instrumentation
+        start = 0 if inst is None else time.perf_counter_ns()
+
+        d = data if isinstance(data, bytes) else data.encode(self.encoding)
+
+        if util.is_schema_command(d):
+            self.schema_version += 1
+
+        self._cache_key = None
+        self._cached = None
+        if self.cache is not None:
+            self._cached = self.cache.lookup(d)
+            if self._cached is not None:
+                if inst is not None:
+                    self._begin_sample(inst, d, start).cached = True
+                return 0
+
+        sample = None if inst is None else self._begin_sample(inst, d, start)
+
+        self._lib.grn_ctx_send(self.ctx, d, len(d), flags)
+
+        if sample is not None:
+            sample.engine_ns = time.perf_counter_ns() - start - sample.send_ns
 
-        self.groonga().grn_ctx_send(self.ctx, d, len(d), flags)
         if self.ctx.rc != 0:
-            err = self.ctx.errbuf.decode(self.groonga.encoding)
+            err = self.ctx.errbuf.decode(self.encoding)
+            if inst is not None:
+                inst.end(err)
             raise error.GroongaError(err)
 
+        if self.cache is not None:
+            self._cache_key = d
+
         return cast(int, self.ctx.rc)
+
+    def _begin_sample(self, inst: Instrumentation, data: bytes, start: int) -> Sample:
+        sample = inst.begin(util.command_name(data).decode(self.encoding))
+        sample.bytes_sent = len(data)
+        sample.send_ns = time.perf_counter_ns() - start
+        return sample
+
+    def _receive(self, copy: bool) -> bytes | memoryview:
+        inst = self.instrumentation
+        if inst is None:
+            return self._recv(copy)
+
+        start = time.perf_counter_ns()
+        raw = self._recv(copy)
+
+        sample = inst.current()
+        if sample is not None:
+            sample.recv_ns = time.perf_counter_ns() - start
+            sample.bytes_received = len(raw)
+        return raw
+
+    def _recv(self, copy: bool) -> bytes | memoryview:
+        if self._cached is not None:
+            raw, self._cached = self._cached, None
+            return raw if copy else memoryview(raw)
+
+        data = c_buf_p()
+        data_len = c_uint()
+        flags = c_int()
+        self._lib.grn_ctx_recv(self.ctx, data, data_len, flags)
+
+        size = data_len.value
+        if self._cache_key is not None and self.cache is not None:
+            raw = string_at(data, size) if size else b""
+            self.cache.store(self._cache_key, raw)
+            self._cache_key = None
+            return raw if copy else memoryview(raw)
+
+        if size == 0:
+            return b""
+
+        if copy:
+            return string_at(data, size)
+
+        buf = (c_char * size).from_address(addressof(data.contents))
+        return memoryview(buf).cast("B")
+
+
+def _python_codec(encoding: str) -> str:
+    return _codec_names.get(encoding, encoding)
+
+
+_codec_names: dict[str, str] = {
+    "default": "utf-8",
+    "none": "utf-8",
+    "utf8": "utf-8",
+    "sjis": "shift_jis",
+    "euc_jp": "euc_jp",
+    "latin1": "latin-1",
+    "koi8r": "koi8_r",
+}
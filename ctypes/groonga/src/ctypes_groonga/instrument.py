@@ -0,0 +1,177 @@
+"""Instrumentation module."""
+
+from collections.abc import Callable
+from typing import Any
+
+# Phases of one command.
+#   send:   encoding and cache lookup before grn_ctx_send
+#   engine: grn_ctx_send which executes command in embedded mode
+#   recv:   grn_ctx_recv and copy of response
+#   parse:  decoding of JSON response
+phases: tuple[str, ...] = ("send", "engine", "recv", "parse")
+
+
+class Histogram:
+    """Latency histogram.
+
+    Bucket `i` counts latencies less than `2 ** i` microseconds.
+    """
+
+    def __init__(self, size: int = 32) -> None:
+        """Initialize."""
+        self.buckets = [0] * size
+        self.count = 0
+        self.total_ns = 0
+
+    def observe(self, ns: int) -> None:
+        """Add latency."""
+        index = min((ns // 1000).bit_length(), len(self.buckets) - 1)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ns += ns
+
+    def percentile(self, q: float) -> float:
+        """Get upper bound of latency in microseconds at percentile."""
+        if self.count == 0:
+            return 0.0
+
+        rank = self.count * q / 100
+        seen = 0
+        for i, num in enumerate(self.buckets):
+            seen += num
+            if rank <= seen:
+                return float(2**i)
+
+        return float(2 ** (len(self.buckets) - 1))
+
+
+class Sample:
+    """Measurement of one command."""
+
+    __slots__ = (
+        "bytes_received",
+        "bytes_sent",
+        "cached",
+        "command",
+        "engine_ns",
+        "error",
+        "parse_ns",
+        "recv_ns",
+        "send_ns",
+    )
+
+    def __init__(self, command: str) -> None:
+        """Initialize."""
+        self.command = command
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.send_ns = 0
+        self.engine_ns = 0
+        self.recv_ns = 0
+        self.parse_ns = 0
+        self.cached = False
+        self.error: str | None = None
+
+
+class CommandStats:
+    """Aggregated measurement of one command name."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.count = 0
+        self.errors = 0
+        self.cached = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency = {p: Histogram() for p in phases}
+
+    def add(self, sample: Sample) -> None:
+        """Aggregate sample."""
+        self.count += 1
+        self.errors += sample.error is not None
+        self.cached += sample.cached
+        self.bytes_sent += sample.bytes_sent
+        self.bytes_received += sample.bytes_received
+        self.latency["send"].observe(sample.send_ns)
+        self.latency["engine"].observe(sample.engine_ns)
+        self.latency["recv"].observe(sample.recv_ns)
+        self.latency["parse"].observe(sample.parse_ns)
+
+
+class Instrumentation:
+    """Per command measurement of Context.
+
+    A sample is completed by `recv`, `recv_raw` or an error of `send`, and
+    passed to hooks. A command which is never received is completed by the
+    next `send` without receive phases.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.commands: dict[str, CommandStats] = {}
+        self.hooks: list[Callable[[Sample], None]] = []
+        self._current: Sample | None = None
+
+    def add_hook(self, hook: Callable[[Sample], None]) -> None:
+        """Add function called with each completed sample."""
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[Sample], None]) -> None:
+        """Remove hook."""
+        self.hooks.remove(hook)
+
+    def reset(self) -> None:
+        """Remove aggregated measurements."""
+        self.commands.clear()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Get aggregated measurements for export."""
+        return {
+            name: {
+                "count": stats.count,
+                "errors": stats.errors,
+                "cached": stats.cached,
+                "bytes_sent": stats.bytes_sent,
+                "bytes_received": stats.bytes_received,
+                "latency_us": {
+                    phase: {
+                        "total": h.total_ns / 1000,
+                        "p50": h.percentile(50),
+                        "p99": h.percentile(99),
+                        "buckets": list(h.buckets),
+                    }
+                    for phase, h in stats.latency.items()
+                },
+            }
+            for name, stats in self.commands.items()
+        }
+
+    def begin(self, command: str) -> Sample:
+        """Start sample of command."""
+        if self._current is not None:
+            self.end()
+
+        self._current = Sample(command)
+        return self._current
+
+    def current(self) -> Sample | None:
+        """Get sample in progress."""
+        return self._current
+
+    def end(self, error: str | None = None) -> None:
+        """Complete sample in progress."""
+        sample = self._current
+        if sample is None:
+            return
+
+        self._current = None
+        if error is not None:
+            sample.error = error
+
+        stats = self.commands.get(sample.command)
+        if stats is None:
+            stats = self.commands[sample.command] = CommandStats()
+        stats.add(sample)
+
+        for hook in self.hooks:
+            hook(sample)
@@ -0,0 +1,128 @@
+"""Library loading module."""
+
+import os
+from collections.abc import Callable
+from ctypes import CDLL
+from ctypes.util import find_library
+from pathlib import Path
+from typing import Any
+
+from . import error
+
+# Environment variable of library path.
+LIBRARY_ENV = "GROONGA_LIBRARY"
+
+type Prototype = tuple[Any, list[Any], Callable[[str], Callable] | None]
+
+
+class Library:
+    """Shared library which binds prototypes at first use.
+
+    Functions not declared in prototypes are returned as is.
+    """
+
+    def __init__(self, lib: CDLL, prototypes: dict[str, Prototype]) -> None:
+        """Initialize."""
+        self._lib = lib
+        self._prototypes = prototypes
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        """Get function and bind prototype."""
+        func = getattr(self._lib, name)
+
+        prototype = self._prototypes.get(name)
+        if prototype is not None:
+            restype, argtypes, errcheck = prototype
+            func.restype = restype
+            func.argtypes = argtypes
+            if errcheck is not None:
+                func.errcheck = errcheck(name)
+
+        # Later lookups do not reach __getattr__.
+        setattr(self, name, func)
+        return func
+
+
+def cache_path() -> Path:
+    """Get path of file which caches resolved library path."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ctypes-groonga" / "library"
+
+
+def check_grn_ctx(name: str) -> Callable:
+    """Create errcheck of function returning grn_ctx."""
+
+    def check[T: Any](result: T, func: Callable, arguments: tuple[Any]) -> T:
+        func_name = name
+        if result is None or not bool(result):
+            raise Exception(f"{func_name}{arguments}")
+        return result
+
+    return check
+
+
+def check_grn_obj(name: str) -> Callable:
+    """Create errcheck of function returning grn_obj."""
+
+    def check[T: Any](result: T, func: Callable, arguments: tuple[Any]) -> T:
+        func_name = name
+        if result is None or not bool(result):
+            raise Exception(f"{func_name}{arguments}")
+        return result
+
+    return check
+
+
+def check_grn_rc(name: str) -> Callable:
+    """Create errcheck of function returning grn_rc."""
+
+    def check[T: Any](result: T, func: Callable, arguments: tuple[Any]) -> T:
+        func_name = name
+        if result != 0:
+            raise Exception(f"{func_name}{arguments}")
+        return result
+
+    return check
+
+
+def find(path: Path | None = None) -> Path:
+    """Resolve library path.
+
+    The path is resolved in the order of argument, environment variable,
+    cache file and `find_library`, which may run external commands.
+    The result of `find_library` is cached, which is a file name resolved
+    by loader on some platforms.
+    """
+    if path is not None:
+        return path
+
+    env = os.environ.get(LIBRARY_ENV)
+    if env:
+        return Path(env)
+
+    cache = cache_path()
+    try:
+        cached = Path(cache.read_text().strip())
+        # Only file name can not be checked without loader.
+        if cached.name and (not cached.is_absolute() or cached.exists()):
+            return cached
+    except OSError:
+        pass
+
+    name = find_library("groonga")
+    if name is None:
+        raise error.NotFoundError("Not found groonga library.")
+
+    resolved = Path(name)
+    _write_cache(cache, resolved)
+    return resolved
+
+
+def _write_cache(cache: Path, path: Path) -> None:
+    try:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache.with_name(f"{cache.name}.{os.getpid()}")
+        tmp.write_text(str(path))
+        tmp.replace(cache)
+    except OSError:
+        pass
@@ -0,0 +1,105 @@
+"""Bulk loader module."""
+
+from __future__ import annotations
+
+import json
+import time
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Self
+
+if TYPE_CHECKING:
+    from .table import Table
+
+
+class BulkLoader:
+    """Buffered loader.
+
+    Records are flushed as one `load` command when the number of records,
+    the encoded size of serialized records or the age of the oldest record reaches
+    the threshold. The age is checked when a record is added. Buffered records
+    are not flushed when the context exits with exception.
+    """
+
+    def __init__(
+        self,
+        table: Table,
+        max_records: int = 1000,
+        max_bytes: int = 1024 * 1024,
+        max_age: float | None = None,
+    ) -> None:
+        """Initialize."""
+        self.table = table
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.loaded = 0
+        self.errors = 0
+        self._buffer: list[str] = []
+        self._size = 0
+        self._since: float | None = None
+
+    def __enter__(self) -> Self:
+        """Enter context."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Exit context and flush unless exception is raised."""
+        if exc_type is None:
+            self.flush()
+
+    def add(self, record: dict[str, Any]) -> None:
+        """Add record to buffer."""
+        self.add_raw(json.dumps(record))
+
+    def add_raw(self, value: str) -> None:
+        """Add serialized record to buffer."""
+        if self._since is None:
+            self._since = time.monotonic()
+
+        self._buffer.append(value)
+        if value.isascii():
+            self._size += len(value)
+        else:
+            self._size += len(value.encode(self.table.ctx.encoding))
+
+        if self._is_full():
+            self.flush()
+
+    def flush(self) -> int:
+        """Load buffered records and return number of loaded records."""
+        if not self._buffer:
+            return 0
+
+        values = f"[{','.join(self._buffer)}]"
+        num = len(self._buffer)
+
+        self._buffer = []
+        self._size = 0
+        self._since = None
+
+        try:
+            loaded = self.table.load(values=values)
+        except Exception:
+            self.errors += num
+            raise
+
+        self.loaded += loaded
+        self.errors += num - loaded
+        return loaded
+
+    def _is_full(self) -> bool:
+        if self.max_records <= len(self._buffer):
+            return True
+
+        if self.max_bytes <= self._size:
+            return True
+
+        if self.max_age is not None and self._since is not None:
+            return self.max_age <= time.monotonic() - self._since
+
+        return False
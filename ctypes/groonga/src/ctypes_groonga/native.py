@@ -0,0 +1,556 @@
+"""Native C API module."""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterable, Iterator, Sequence
+from ctypes import addressof, c_int, c_uint, c_void_p, string_at
+from typing import TYPE_CHECKING, Any, cast
+
+from . import error
+from .groonga import GrnObj, GrnTableSortKey
+from .resultset import ResultSet, Row, row_class
+
+if TYPE_CHECKING:
+    from .groonga import Context
+
+# grn_obj types
+GRN_VOID = 0x00
+GRN_BULK = 0x02
+GRN_UVECTOR = 0x04
+GRN_VECTOR = 0x06
+
+# grn_obj implementation flags
+GRN_OBJ_OUTPLACE = 0x01 << 1
+
+# Size of bulk stored in grn_obj itself.
+GRN_BULK_BUFSIZE_MAX = 0x1F
+
+# grn_obj_set_value flags
+GRN_OBJ_SET = 0x01
+
+# grn_table_create flags
+GRN_OBJ_TABLE_NO_KEY = 0x03
+
+# grn_operator
+GRN_OP_AND = 7
+GRN_OP_OR = 9
+GRN_OP_MATCH = 36
+
+# grn_expr_flags
+GRN_EXPR_SYNTAX_QUERY = 0x00
+GRN_EXPR_SYNTAX_SCRIPT = 0x01
+GRN_EXPR_ALLOW_PRAGMA = 0x02
+GRN_EXPR_ALLOW_COLUMN = 0x04
+
+# grn_table_sort_flags
+GRN_TABLE_SORT_DESC = 0x01 << 0
+
+# grn_table_cursor_open flags
+GRN_CURSOR_ASCENDING = 0x00 << 0
+GRN_CURSOR_BY_ID = 0x01 << 3
+
+# Built-in types
+GRN_DB_BOOL = 3
+GRN_DB_INT8 = 4
+GRN_DB_UINT8 = 5
+GRN_DB_INT16 = 6
+GRN_DB_UINT16 = 7
+GRN_DB_INT32 = 8
+GRN_DB_UINT32 = 9
+GRN_DB_INT64 = 10
+GRN_DB_UINT64 = 11
+GRN_DB_FLOAT = 12
+GRN_DB_TIME = 13
+GRN_DB_SHORT_TEXT = 14
+GRN_DB_TEXT = 15
+GRN_DB_LONG_TEXT = 16
+GRN_DB_TOKYO_GEO_POINT = 17
+GRN_DB_WGS84_GEO_POINT = 18
+
+# Record id of no record.
+GRN_ID_NIL = 0
+
+# Ids less than this are reserved for built-in types.
+GRN_N_RESERVED_TYPES = 256
+
+_formats: dict[int, struct.Struct] = {
+    GRN_DB_BOOL: struct.Struct("=?"),
+    GRN_DB_INT8: struct.Struct("=b"),
+    GRN_DB_UINT8: struct.Struct("=B"),
+    GRN_DB_INT16: struct.Struct("=h"),
+    GRN_DB_UINT16: struct.Struct("=H"),
+    GRN_DB_INT32: struct.Struct("=i"),
+    GRN_DB_UINT32: struct.Struct("=I"),
+    GRN_DB_INT64: struct.Struct("=q"),
+    GRN_DB_UINT64: struct.Struct("=Q"),
+    GRN_DB_FLOAT: struct.Struct("=d"),
+    GRN_DB_TIME: struct.Struct("=q"),
+    GRN_DB_TOKYO_GEO_POINT: struct.Struct("=ii"),
+    GRN_DB_WGS84_GEO_POINT: struct.Struct("=ii"),
+}
+
+_geo_point_types: set[int] = {
+    GRN_DB_TOKYO_GEO_POINT,
+    GRN_DB_WGS84_GEO_POINT,
+}
+
+_record_id_format = struct.Struct("=I")
+
+_text_types: set[int] = {
+    GRN_DB_SHORT_TEXT,
+    GRN_DB_TEXT,
+    GRN_DB_LONG_TEXT,
+}
+
+
+class _Writer:
+    """Writer of records with resolved columns."""
+
+    def __init__(self, ctx: Context, table: int) -> None:
+        """Initialize."""
+        self.ctx = ctx
+        self.table = table
+        self.key_domain = GrnObj.from_address(table).header.domain
+        self.key_index: int | None = None
+        self.handles: list[int | None] = []
+        self.ranges: list[int] = []
+        self.bulks: list[GrnObj] = []
+        self.vectors: list[GrnObj] = []
+        self._added = c_int()
+
+    def add_column(self, name: str) -> None:
+        """Resolve column."""
+        if name == "_key":
+            self.key_index = len(self.handles)
+            self.handles.append(None)
+            self.ranges.append(self.key_domain)
+        else:
+            handle = _open_column(self.ctx, self.table, name)
+            self.handles.append(handle)
+            self.ranges.append(self.ctx.groonga().grn_obj_get_range(self.ctx.ctx, handle))
+
+        self.bulks.append(GrnObj())
+        vector = GrnObj()
+        vector.header.type = GRN_VECTOR
+        vector.header.domain = GRN_DB_TEXT
+        self.vectors.append(vector)
+
+    def close(self) -> None:
+        """Release objects."""
+        lib = self.ctx.groonga()
+        for value in self.bulks + self.vectors:
+            lib.grn_obj_close(self.ctx.ctx, value)
+
+        _close(self.ctx, self.table, [h for h in self.handles if h is not None])
+
+    def write(self, row: Sequence[Any]) -> None:
+        """Add or update record."""
+        ctx = self.ctx
+        lib = ctx.groonga()
+
+        if len(row) != len(self.handles):
+            raise ValueError(f"Expected {len(self.handles)} values: {len(row)}")
+
+        if self.key_index is None:
+            record_id = lib.grn_table_add(ctx.ctx, self.table, None, 0, self._added)
+        else:
+            key = _encode_key(ctx.encoding, self.key_domain, row[self.key_index])
+            record_id = lib.grn_table_add(ctx.ctx, self.table, key, len(key), self._added)
+        if record_id == GRN_ID_NIL:
+            raise error.GroongaError(ctx.ctx.errbuf.decode(ctx.encoding))
+
+        for i, value in enumerate(row):
+            handle = self.handles[i]
+            if handle is None or value is None:
+                continue
+
+            if isinstance(value, list):
+                data = _set_vector(ctx, self.bulks[i], self.vectors[i], self.ranges[i], value)
+            else:
+                data = _set_bulk(ctx, self.bulks[i], self.ranges[i], value)
+
+            lib.grn_obj_set_value(ctx.ctx, handle, record_id, data, GRN_OBJ_SET)
+            if ctx.ctx.rc != 0:
+                raise error.GroongaError(ctx.ctx.errbuf.decode(ctx.encoding))
+
+
+def insert(
+    ctx: Context,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+) -> tuple[int, list[tuple[int, str]]]:
+    """Add or update records and return number of rows and errors.
+
+    Values of a row are in the order of `columns`, and `_key` is the key of
+    the record. None leaves the value unchanged. Strings are converted to
+    the type of column by database. Values set before an error of a row are
+    kept as `load` does.
+    """
+    writer = _Writer(ctx, _open_table(ctx, table))
+    inserted = 0
+    errors: list[tuple[int, str]] = []
+    try:
+        for name in columns:
+            writer.add_column(name)
+
+        for index, row in enumerate(rows):
+            try:
+                writer.write(row)
+            except (error.GroongaError, TypeError, ValueError, struct.error) as e:
+                errors.append((index, str(e)))
+                ctx.ctx.rc = 0
+                ctx.ctx.errbuf = b""
+            else:
+                inserted += 1
+    finally:
+        writer.close()
+
+        if ctx.cache is not None:
+            ctx.cache.invalidate(table)
+
+    return inserted, errors
+
+
+def scan(
+    ctx: Context,
+    table: str,
+    columns: Sequence[str],
+    offset: int = 0,
+    limit: int = -1,
+) -> Iterator[Row]:
+    """Iterate values of columns in record id order.
+
+    Values of reference columns are record ids of the referred table,
+    and values of Time columns are seconds as float.
+    """
+    lib = ctx.groonga()
+
+    obj = _open_table(ctx, table)
+
+    handles: list[int] = []
+    values: list[GrnObj] = []
+    cursor = None
+    try:
+        for name in columns:
+            handles.append(_open_column(ctx, obj, name))
+            values.append(GrnObj())
+
+        flags = GRN_CURSOR_ASCENDING | GRN_CURSOR_BY_ID
+        cursor = lib.grn_table_cursor_open(ctx.ctx, obj, None, 0, None, 0, offset, limit, flags)
+        if not cursor:
+            raise error.GroongaError(ctx.ctx.errbuf.decode(ctx.encoding))
+
+        record = row_class(tuple(columns))
+        pairs = list(zip(handles, values, strict=True))
+        while record_id := lib.grn_table_cursor_next(ctx.ctx, cursor):
+            row = []
+            for handle, value in pairs:
+                _rewind(value)
+                lib.grn_obj_get_value(ctx.ctx, handle, record_id, value)
+                row.append(decode(ctx, value))
+
+            yield record(row)
+    finally:
+        if cursor:
+            lib.grn_table_cursor_close(ctx.ctx, cursor)
+
+        for value in values:
+            lib.grn_obj_close(ctx.ctx, value)
+
+        _close(ctx, obj, handles)
+
+
+def search(  # noqa: PLR0913
+    ctx: Context,
+    table: str,
+    query: str,
+    match_columns: str,
+    output_columns: Sequence[str],
+    *,
+    offset: int = 0,
+    limit: int = 10,
+) -> tuple[int, ResultSet]:
+    """Get records matching query in descending order of score.
+
+    `query` and `match_columns` are the same syntax as `select`.
+    """
+    lib = ctx.groonga()
+
+    obj = _open_table(ctx, table)
+
+    objs: list[int] = []
+    handles: list[int] = []
+    values: list[GrnObj] = []
+    cursor = None
+    try:
+        match = _create_query(ctx, obj, objs)
+        _parse(ctx, match, match_columns, None, GRN_EXPR_SYNTAX_SCRIPT)
+
+        condition = _create_query(ctx, obj, objs)
+        flags = GRN_EXPR_SYNTAX_QUERY | GRN_EXPR_ALLOW_PRAGMA | GRN_EXPR_ALLOW_COLUMN
+        _parse(ctx, condition, query, match, flags)
+
+        result = lib.grn_table_select(ctx.ctx, obj, condition, None, GRN_OP_OR)
+        if not result:
+            raise error.GroongaError(ctx.ctx.errbuf.decode(ctx.encoding))
+        objs.append(result)
+
+        hits = lib.grn_table_size(ctx.ctx, result)
+        rows: list[list[Any]] = []
+        if hits <= offset:
+            return hits, ResultSet(list(output_columns), rows)
+
+        for name in output_columns:
+            handles.append(_open_column(ctx, result, name))
+            values.append(GrnObj())
+        pairs = list(zip(handles, values, strict=True))
+
+        sorted_result = lib.grn_table_create(
+            ctx.ctx, None, 0, None, GRN_OBJ_TABLE_NO_KEY, None, result
+        )
+        if not sorted_result:
+            raise error.GroongaError(ctx.ctx.errbuf.decode(ctx.encoding))
+        objs.append(sorted_result)
+
+        key = GrnTableSortKey(_open_column(ctx, result, "_score"), GRN_TABLE_SORT_DESC, 0)
+        handles.append(key.key)
+        lib.grn_table_sort(ctx.ctx, result, offset, limit, sorted_result, key, 1)
+        if ctx.ctx.rc != 0:
+            raise error.GroongaError(ctx.ctx.errbuf.decode(ctx.encoding))
+
+        cursor = lib.grn_table_cursor_open(
+            ctx.ctx, sorted_result, None, 0, None, 0, 0, -1, GRN_CURSOR_BY_ID
+        )
+        if not cursor:
+            raise error.GroongaError(ctx.ctx.errbuf.decode(ctx.encoding))
+
+        value_p = c_void_p()
+        while lib.grn_table_cursor_next(ctx.ctx, cursor):
+            # Records of sorted table refer to records of result table.
+            lib.grn_table_cursor_get_value(ctx.ctx, cursor, value_p)
+            record_id = c_uint.from_address(cast(int, value_p.value)).value
+
+            row = []
+            for handle, value in pairs:
+                _rewind(value)
+                lib.grn_obj_get_value(ctx.ctx, handle, record_id, value)
+                row.append(decode(ctx, value))
+            rows.append(row)
+
+        return hits, ResultSet(list(output_columns), rows)
+    finally:
+        if cursor:
+            lib.grn_table_cursor_close(ctx.ctx, cursor)
+
+        for value in values:
+            lib.grn_obj_close(ctx.ctx, value)
+
+        # Unlink temporary objects in reverse order of creation.
+        _close(ctx, obj, handles + objs[::-1])
+
+
+def decode(ctx: Context, value: GrnObj) -> Any:  # noqa: ANN401
+    """Convert grn_obj to Python value."""
+    if value.header.type == GRN_VECTOR:
+        return _decode_vector(ctx, value)
+
+    domain = value.header.domain
+    head, size = _bulk(value)
+    data = string_at(head, size) if size else b""
+
+    if value.header.type != GRN_UVECTOR:
+        return _decode(ctx.encoding, domain, data)
+
+    fmt = _record_id_format if GRN_N_RESERVED_TYPES <= domain else _formats.get(domain)
+    if fmt is None:
+        return data
+
+    return [_convert(domain, v) for v in fmt.iter_unpack(data)]
+
+
+def _bulk(value: GrnObj) -> tuple[int, int]:
+    # Same as GRN_BULK_HEAD() and GRN_BULK_VSIZE().
+    if value.header.impl_flags & GRN_OBJ_OUTPLACE:
+        head = value.u.b.head or 0
+        curr = value.u.b.curr or 0
+        return head, curr - head
+
+    return addressof(value) + GrnObj.u.offset, value.header.flags & GRN_BULK_BUFSIZE_MAX
+
+
+def _close(ctx: Context, table: int, columns: list[int]) -> None:
+    lib = ctx.groonga()
+    for column in columns:
+        lib.grn_obj_unlink(ctx.ctx, column)
+    lib.grn_obj_unlink(ctx.ctx, table)
+
+
+def _convert(domain: int, values: tuple[Any, ...]) -> Any:  # noqa: ANN401
+    if domain == GRN_DB_TIME:
+        return values[0] / 1_000_000
+
+    if domain in _geo_point_types:
+        return values
+
+    return values[0]
+
+
+def _create_query(ctx: Context, table: int, objs: list[int]) -> int:
+    # Same as GRN_EXPR_CREATE_FOR_QUERY().
+    lib = ctx.groonga()
+
+    expr = lib.grn_expr_create(ctx.ctx, None, 0)
+    if not expr:
+        raise error.GroongaError(ctx.ctx.errbuf.decode(ctx.encoding))
+    objs.append(expr)
+
+    var = lib.grn_expr_add_var(ctx.ctx, expr, None, 0)
+    if not var:
+        raise error.GroongaError(ctx.ctx.errbuf.decode(ctx.encoding))
+
+    record = GrnObj.from_address(var)
+    record.header.type = GRN_BULK
+    record.header.impl_flags = 0
+    record.header.flags = 0
+    record.header.domain = lib.grn_obj_id(ctx.ctx, table)
+    record.u.b.head = record.u.b.curr = record.u.b.tail = None
+    return cast(int, expr)
+
+
+def _decode(encoding: str, domain: int, data: bytes) -> Any:  # noqa: ANN401
+    if domain in _text_types:
+        return data.decode(encoding)
+
+    if not data:
+        return None
+
+    if GRN_N_RESERVED_TYPES <= domain:
+        return _record_id_format.unpack_from(data)[0]
+
+    fmt = _formats.get(domain)
+    if fmt is None:
+        return data
+
+    return _convert(domain, fmt.unpack_from(data))
+
+
+def _decode_vector(ctx: Context, value: GrnObj) -> list[Any]:
+    lib = ctx.groonga()
+
+    elements = []
+    for i in range(lib.grn_vector_size(ctx.ctx, value)):
+        head = c_void_p()
+        weight = c_uint()
+        domain = c_uint()
+        size = lib.grn_vector_get_element(ctx.ctx, value, i, head, weight, domain)
+        data = string_at(head, size) if size else b""
+        elements.append(_decode(ctx.encoding, domain.value, data))
+
+    return elements
+
+
+def _encode(encoding: str, domain: int, value: Any) -> tuple[int, bytes]:  # noqa: ANN401
+    if isinstance(value, str):
+        return GRN_DB_TEXT, value.encode(encoding)
+
+    if isinstance(value, bool):
+        return GRN_DB_BOOL, _formats[GRN_DB_BOOL].pack(value)
+
+    if domain == GRN_DB_TIME:
+        return domain, _formats[domain].pack(round(value * 1_000_000))
+
+    fmt = _record_id_format if GRN_N_RESERVED_TYPES <= domain else _formats.get(domain)
+    if fmt is None:
+        raise TypeError(f"Unsupported value: {value!r}")
+
+    if domain in _geo_point_types:
+        return domain, fmt.pack(*value)
+
+    return domain, fmt.pack(value)
+
+
+def _encode_key(encoding: str, domain: int, value: Any) -> bytes:  # noqa: ANN401
+    value_domain, data = _encode(encoding, domain, value)
+    if value_domain != domain and not {value_domain, domain} <= _text_types:
+        raise error.ColumnTypeError(f"Invalid key: {value!r}")
+
+    return data
+
+
+def _open_column(ctx: Context, table: int, name: str) -> int:
+    raw_name = name.encode(ctx.encoding)
+    column = ctx.groonga().grn_obj_column(ctx.ctx, table, raw_name, len(raw_name))
+    if not column:
+        raise error.ColumnNotFoundError(name)
+
+    return cast(int, column)
+
+
+def _open_table(ctx: Context, name: str) -> int:
+    raw_name = name.encode(ctx.encoding)
+    table = ctx.groonga().grn_ctx_get(ctx.ctx, raw_name, len(raw_name))
+    if not table:
+        raise error.TableNotFoundError(name)
+
+    return cast(int, table)
+
+
+def _parse(ctx: Context, expr: int, text: str, default_column: int | None, flags: int) -> None:
+    raw_text = text.encode(ctx.encoding)
+    rc = ctx.groonga().grn_expr_parse(
+        ctx.ctx, expr, raw_text, len(raw_text), default_column, GRN_OP_MATCH, GRN_OP_AND, flags
+    )
+    if rc != 0:
+        raise error.GroongaError(ctx.ctx.errbuf.decode(ctx.encoding))
+
+
+def _rewind(value: GrnObj) -> None:
+    # Same as GRN_BULK_REWIND().
+    if value.header.type == GRN_VECTOR:
+        if value.u.v.body:
+            _rewind(GrnObj.from_address(value.u.v.body))
+        value.u.v.n_sections = 0
+    elif value.header.impl_flags & GRN_OBJ_OUTPLACE:
+        value.u.b.curr = value.u.b.head
+    else:
+        value.header.flags &= ~GRN_BULK_BUFSIZE_MAX
+
+
+def _set_bulk(ctx: Context, bulk: GrnObj, domain: int, value: Any) -> GrnObj:  # noqa: ANN401
+    value_domain, data = _encode(ctx.encoding, domain, value)
+
+    _rewind(bulk)
+    bulk.header.type = GRN_BULK
+    bulk.header.domain = value_domain
+    ctx.groonga().grn_bulk_write(ctx.ctx, bulk, data, len(data))
+    return bulk
+
+
+def _set_vector(
+    ctx: Context,
+    bulk: GrnObj,
+    vector: GrnObj,
+    domain: int,
+    values: list[Any],
+) -> GrnObj:
+    lib = ctx.groonga()
+
+    if all(isinstance(v, str) for v in values):
+        _rewind(vector)
+        for value in values:
+            data = value.encode(ctx.encoding)
+            lib.grn_vector_add_element(ctx.ctx, vector, data, len(data), 0, GRN_DB_TEXT)
+        return vector
+
+    elements = [_encode(ctx.encoding, domain, v) for v in values]
+    if any(d != domain for d, _ in elements):
+        raise error.ColumnTypeError(f"Invalid vector: {values!r}")
+
+    data = b"".join(e for _, e in elements)
+    _rewind(bulk)
+    bulk.header.type = GRN_UVECTOR
+    bulk.header.domain = domain
+    lib.grn_bulk_write(ctx.ctx, bulk, data, len(data))
+    return bulk
@@ -0,0 +1,116 @@
+"""Command pipeline module."""
+
+from __future__ import annotations
+
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Self
+
+from . import error, util
+
+if TYPE_CHECKING:
+    from .groonga import Context
+
+# grn_ctx_send flags
+GRN_CTX_QUIET = 0x08
+
+
+class CommandResult:
+    """Result of command in pipeline."""
+
+    __slots__ = ("command", "error", "value")
+
+    def __init__(self, command: bytes) -> None:
+        """Initialize."""
+        self.command = command
+        self.value: Any = None
+        self.error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Check command succeeded."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        """Get representation."""
+        return f"CommandResult(command={self.command!r}, error={self.error!r})"
+
+
+class Pipeline:
+    """Group of commands with per command results.
+
+    Embedded mode executes a command within `grn_ctx_send`, so commands can
+    not be batched. Each command is sent and its response is received in
+    order, and an error is attributed to the command which caused it.
+    Responses of quiet commands are discarded without decoding. Commands are
+    executed when the context exits without an exception.
+    """
+
+    def __init__(self, ctx: Context) -> None:
+        """Initialize."""
+        self.ctx = ctx
+        self.results: list[CommandResult] = []
+        self._commands: list[tuple[bytes, bool]] = []
+
+    def __enter__(self) -> Self:
+        """Enter context."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Exit context."""
+        if exc_type is not None:
+            self._commands = []
+            return
+
+        results = self.execute(stop_on_error=True)
+        errors = [(i, r.error) for i, r in enumerate(results) if r.error is not None]
+        if errors:
+            raise error.PipelineError(errors)
+
+    def __len__(self) -> int:
+        """Count pending commands."""
+        return len(self._commands)
+
+    def add(self, command: str, /, quiet: bool = False, **kwargs: Any) -> int:  # noqa: ANN401
+        """Add command with options and return its index."""
+        return self.add_raw(f"{command} {util.create_cmd(kwargs)}", quiet)
+
+    def add_raw(self, cmd: str | bytes, quiet: bool = False) -> int:
+        """Add command line and return its index."""
+        d = cmd if isinstance(cmd, bytes) else cmd.encode(self.ctx.encoding)
+        self._commands.append((d, quiet))
+        return len(self._commands) - 1
+
+    def execute(self, stop_on_error: bool = False) -> list[CommandResult]:
+        """Execute pending commands and return results in order.
+
+        If `stop_on_error` is true, commands after the first error are not
+        sent and their results have no value nor error.
+        """
+        commands, self._commands = self._commands, []
+        self.results = [CommandResult(cmd) for cmd, _ in commands]
+
+        for i, (cmd, quiet) in enumerate(commands):
+            result = self.results[i]
+
+            flags = GRN_CTX_QUIET if quiet else 0
+            try:
+                self.ctx.send(cmd, flags)
+            except error.GroongaError as e:
+                result.error = str(e)
+                # Discard partial output of failed command.
+                self.ctx.recv_raw(copy=False)
+                if stop_on_error:
+                    break
+                continue
+
+            if quiet:
+                self.ctx.recv_raw(copy=False)
+            else:
+                result.value = self.ctx.recv()
+
+        return self.results
@@ -0,0 +1,137 @@
+"""Context pool module."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from queue import Empty, LifoQueue
+from types import TracebackType
+from typing import TYPE_CHECKING, Self
+
+from . import error
+
+if TYPE_CHECKING:
+    from .groonga import Context, Groonga
+
+
+class ContextPool:
+    """Pool of grn_ctx opened against same database.
+
+    grn_ctx must not be shared by threads, so each context is lent to one
+    thread at a time.
+    """
+
+    def __init__(self, groonga: Groonga, path: Path, size: int = 4, flags: int = 0) -> None:
+        """Initialize."""
+        self.groonga = groonga
+        self.path = path
+        self.size = size
+        self.flags = flags
+        self.recycled = 0
+        self.wait_count = 0
+        self.wait_max = 0.0
+        self.wait_total = 0.0
+        self._busy: set[int] = set()
+        self._closed = False
+        self._idle: LifoQueue[Context] = LifoQueue()
+        self._lock = threading.Lock()
+
+        for _ in range(size):
+            self._idle.put(groonga.open_ctx(path, flags))
+
+    def __enter__(self) -> Self:
+        """Enter context."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Exit context."""
+        self.close()
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Get wait statistics."""
+        with self._lock:
+            avg = self.wait_total / self.wait_count if self.wait_count else 0.0
+            return {
+                "busy": len(self._busy),
+                "recycled": self.recycled,
+                "wait_avg": avg,
+                "wait_count": self.wait_count,
+                "wait_max": self.wait_max,
+                "wait_total": self.wait_total,
+            }
+
+    @contextmanager
+    def acquire(self, timeout: float | None = None) -> Iterator[Context]:
+        """Borrow context.
+
+        The context is reopened if an error occurs while it is borrowed.
+        """
+        ctx = self._get(timeout)
+        try:
+            yield ctx
+        except BaseException:
+            self._put(ctx, True)
+            raise
+
+        self._put(ctx, ctx.ctx.rc != 0)
+
+    def close(self) -> None:
+        """Close idle contexts.
+
+        Borrowed contexts are closed when they are returned.
+        """
+        with self._lock:
+            self._closed = True
+
+        while True:
+            try:
+                ctx = self._idle.get_nowait()
+            except Empty:
+                break
+
+            self.groonga.close_ctx(ctx)
+
+    def _get(self, timeout: float | None) -> Context:
+        if self._closed:
+            raise error.GroongaError("Context pool is closed.")
+
+        start = time.perf_counter()
+        try:
+            ctx = self._idle.get(timeout=timeout)
+        except Empty:
+            raise TimeoutError("Not available context in pool.") from None
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._busy.add(id(ctx))
+            self.wait_count += 1
+            self.wait_max = max(self.wait_max, elapsed)
+            self.wait_total += elapsed
+
+        return ctx
+
+    def _put(self, ctx: Context, broken: bool) -> None:
+        with self._lock:
+            self._busy.remove(id(ctx))
+            closed = self._closed
+
+        if closed:
+            self.groonga.close_ctx(ctx)
+            return
+
+        if broken:
+            self.groonga.close_ctx(ctx)
+            ctx = self.groonga.open_ctx(self.path, self.flags)
+            with self._lock:
+                self.recycled += 1
+
+        self._idle.put(ctx)
@@ -0,0 +1,63 @@
+"""Prepared command module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from . import util
+from .resultset import ResultSet, parse_select
+
+if TYPE_CHECKING:
+    from .groonga import Context
+
+
+class PreparedCommand:
+    """Command with pre-encoded static options.
+
+    Only bound parameters are escaped and encoded at execution.
+    """
+
+    def __init__(self, ctx: Context, name: str, **kwargs: Any) -> None:  # noqa: ANN401
+        """Initialize."""
+        self.ctx = ctx
+        self.name = name
+        self.options = kwargs
+        self._static = f"{name} {util.create_cmd(kwargs)}".encode(ctx.encoding)
+        self._prefixes: dict[str, bytes] = {}
+
+    def execute(self, **kwargs: Any) -> Any:  # noqa: ANN401
+        """Execute command with bound parameters."""
+        self.ctx.send(self.bind(**kwargs))
+        return self.ctx.recv()
+
+    def bind(self, **kwargs: Any) -> bytes:  # noqa: ANN401
+        """Create command line with bound parameters."""
+        encoding = self.ctx.encoding
+
+        args = [self._static]
+        for key, value in kwargs.items():
+            prefix = self._prefixes.get(key)
+            if prefix is None:
+                prefix = self._prefixes[key] = f" --{key} '".encode(encoding)
+
+            args.append(prefix)
+            args.append(util.escape(str(value)).encode(encoding))
+            args.append(b"'")
+
+        return b"".join(args)
+
+
+class PreparedSelect(PreparedCommand):
+    """Prepared select command."""
+
+    def __init__(self, ctx: Context, **kwargs: Any) -> None:  # noqa: ANN401
+        """Initialize."""
+        super().__init__(ctx, "select", **kwargs)
+
+    def execute(self, **kwargs: Any) -> tuple[int, ResultSet]:  # noqa: ANN401
+        """Get matching records with bound parameters."""
+        if "limit" not in self.options and "limit" not in kwargs:
+            kwargs["limit"] = -1
+
+        ret = super().execute(**kwargs)
+        return parse_select(ret)
@@ -0,0 +1,168 @@
+"""Query log module."""
+
+import heapq
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+# Query log flags
+GRN_QUERY_LOG_NONE = 0x00
+GRN_QUERY_LOG_COMMAND = 0x01 << 0
+GRN_QUERY_LOG_RESULT_CODE = 0x01 << 1
+GRN_QUERY_LOG_DESTINATION = 0x01 << 2
+GRN_QUERY_LOG_CACHE = 0x01 << 3
+GRN_QUERY_LOG_SIZE = 0x01 << 4
+GRN_QUERY_LOG_SCORE = 0x01 << 5
+GRN_QUERY_LOG_ALL = (
+    GRN_QUERY_LOG_COMMAND
+    | GRN_QUERY_LOG_RESULT_CODE
+    | GRN_QUERY_LOG_DESTINATION
+    | GRN_QUERY_LOG_CACHE
+    | GRN_QUERY_LOG_SIZE
+    | GRN_QUERY_LOG_SCORE
+)
+GRN_QUERY_LOG_DEFAULT = GRN_QUERY_LOG_ALL
+
+# 2011-07-05 06:25:19.458756|0x7fff5f43ac00|>select Shops
+# 2011-07-05 06:25:19.458829|0x7fff5f43ac00|:000000000072779 filter(1)
+# 2011-07-05 06:25:19.459021|0x7fff5f43ac00|<000000000265239 rc=0
+_line_pattern = re.compile(r"(?P<timestamp>[^|]*)\|(?P<id>[^|]*)\|(?P<mark>[>:<])(?P<message>.*)")
+_stage_pattern = re.compile(r"(?P<elapsed>\d+) (?P<stage>[^\s(]+)(?:\((?P<n>\d+)\))?")
+_end_pattern = re.compile(r"(?P<elapsed>\d+) rc=(?P<rc>-?\d+)")
+_name_pattern = re.compile(r"(?:/d/)?(?P<name>[^\s?.]*)")
+
+
+class QueryLogEntry:
+    """Query log of one command.
+
+    Elapsed time of a stage is the time since the previous stage.
+    """
+
+    def __init__(self, timestamp: str, command: str) -> None:
+        """Initialize."""
+        self.timestamp = timestamp
+        self.command = command
+        self.name = _command_name(command)
+        self.stages: list[tuple[str, int, int]] = []
+        self.elapsed_ns = 0
+        self.rc: int | None = None
+
+    def __repr__(self) -> str:
+        """Get representation."""
+        return f"QueryLogEntry(name={self.name!r}, elapsed_ns={self.elapsed_ns}, rc={self.rc})"
+
+
+class QueryLogParser:
+    """Incremental parser of query log lines."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._entries: dict[str, tuple[QueryLogEntry, int]] = {}
+
+    def feed(self, line: str) -> QueryLogEntry | None:
+        """Parse line and return entry when its command is completed."""
+        m = _line_pattern.match(line.rstrip("\n"))
+        if m is None:
+            return None
+
+        key = m.group("id")
+        mark = m.group("mark")
+        message = m.group("message")
+
+        if mark == ">":
+            self._entries[key] = (QueryLogEntry(m.group("timestamp"), message), 0)
+            return None
+
+        current = self._entries.get(key)
+        if current is None:
+            return None
+
+        entry, last = current
+        if mark == ":":
+            s = _stage_pattern.match(message)
+            if s is not None:
+                elapsed = int(s.group("elapsed"))
+                n = int(s.group("n") or 0)
+                entry.stages.append((s.group("stage"), n, elapsed - last))
+                self._entries[key] = (entry, elapsed)
+            return None
+
+        del self._entries[key]
+        e = _end_pattern.match(message)
+        if e is not None:
+            entry.elapsed_ns = int(e.group("elapsed"))
+            entry.rc = int(e.group("rc"))
+        return entry
+
+
+class QueryLogCollector:
+    """Callback of query logger which keeps recent entries."""
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        """Initialize."""
+        self.entries: deque[QueryLogEntry] = deque(maxlen=max_entries)
+        self._parser = QueryLogParser()
+
+    def __call__(self, line: str) -> None:
+        """Add line."""
+        entry = self._parser.feed(line)
+        if entry is not None:
+            self.entries.append(entry)
+
+    def report(self, top: int = 10) -> dict[str, Any]:
+        """Summarize collected entries."""
+        return report(self.entries, top)
+
+
+def parse(lines: Iterable[str]) -> Iterator[QueryLogEntry]:
+    """Parse query log lines into completed entries."""
+    parser = QueryLogParser()
+    for line in lines:
+        entry = parser.feed(line)
+        if entry is not None:
+            yield entry
+
+
+def report(entries: Iterable[QueryLogEntry], top: int = 10) -> dict[str, Any]:
+    """Summarize stage timings by command name and slowest commands.
+
+    Times are milliseconds.
+    """
+    commands: dict[str, dict[str, Any]] = {}
+    slow: list[tuple[int, int, QueryLogEntry]] = []
+
+    for i, entry in enumerate(entries):
+        stats = commands.get(entry.name)
+        if stats is None:
+            stats = commands[entry.name] = {"count": 0, "errors": 0, "total": 0.0, "stages": {}}
+        stats["count"] += 1
+        stats["errors"] += entry.rc not in (None, 0)
+        stats["total"] += entry.elapsed_ns / 1e6
+        for stage, _, elapsed in entry.stages:
+            stats["stages"][stage] = stats["stages"].get(stage, 0.0) + elapsed / 1e6
+
+        item = (entry.elapsed_ns, -i, entry)
+        if len(slow) < top:
+            heapq.heappush(slow, item)
+        elif slow and slow[0] < item:
+            heapq.heapreplace(slow, item)
+
+    return {
+        "commands": commands,
+        "slow": [
+            {
+                "timestamp": entry.timestamp,
+                "command": entry.command,
+                "elapsed": entry.elapsed_ns / 1e6,
+                "rc": entry.rc,
+                "stages": [(stage, n, elapsed / 1e6) for stage, n, elapsed in entry.stages],
+            }
+            for _, _, entry in sorted(slow, key=lambda s: (-s[0], -s[1]))
+        ],
+    }
+
+
+def _command_name(command: str) -> str:
+    m = _name_pattern.match(command)
+    return "" if m is None else m.group("name")
@@ -0,0 +1,111 @@
+"""Result set module."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from functools import cache
+from operator import itemgetter
+from typing import Any, overload
+
+
+class Row:
+    """Result row.
+
+    Row refers to the raw list returned by database.
+    """
+
+    __slots__ = ("_values",)
+
+    _fields: tuple[str, ...] = ()
+
+    def __init__(self, values: list[Any]) -> None:
+        """Initialize."""
+        self._values = values
+
+    def __eq__(self, other: object) -> bool:
+        """Compare values."""
+        if not isinstance(other, Row):
+            return NotImplemented
+
+        return self._fields == other._fields and self._values == other._values
+
+    def __getitem__(self, index: int) -> Any:  # noqa: ANN401
+        """Get value by index."""
+        return self._values[index]
+
+    def __hash__(self) -> int:
+        """Get hash."""
+        return hash((self._fields, tuple(self._values)))
+
+    def __repr__(self) -> str:
+        """Get representation."""
+        values = ", ".join(f"{k}={v!r}" for k, v in zip(self._fields, self._values, strict=True))
+        return f"{type(self).__name__}({values})"
+
+    def _asdict(self) -> dict[str, Any]:
+        return dict(zip(self._fields, self._values, strict=True))
+
+
+class ResultSet(Sequence[Row]):
+    """Result set."""
+
+    def __init__(
+        self,
+        keys: list[str],
+        rows: list[list[Any]],
+        types: list[str] | None = None,
+    ) -> None:
+        """Initialize."""
+        self.keys = keys
+        self.rows = rows
+        self.types = types
+        self._row_class = row_class(tuple(keys))
+
+    @overload
+    def __getitem__(self, index: int) -> Row: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> ResultSet: ...
+
+    def __getitem__(self, index: int | slice) -> Row | ResultSet:
+        """Get row."""
+        if isinstance(index, slice):
+            return ResultSet(self.keys, self.rows[index], self.types)
+
+        return self._row_class(self.rows[index])
+
+    def __iter__(self) -> Iterator[Row]:
+        """Iterate rows."""
+        return map(self._row_class, self.rows)
+
+    def __len__(self) -> int:
+        """Count rows."""
+        return len(self.rows)
+
+    def __repr__(self) -> str:
+        """Get representation."""
+        return f"ResultSet(keys={self.keys!r}, rows={len(self.rows)})"
+
+
+@cache
+def row_class(keys: tuple[str, ...]) -> type[Row]:
+    """Get row class shared by same columns."""
+    fields = tuple(k.lstrip("_") for k in keys)
+
+    namespace: dict[str, Any] = {"__slots__": (), "_fields": fields}
+    for i, field in enumerate(fields):
+        namespace[field] = property(itemgetter(i))
+
+    return type("Record", (Row,), namespace)
+
+
+def parse_select(ret: list) -> tuple[int, ResultSet]:
+    """Parse select response."""
+    result = ret[0]
+    hits = result[0][0]
+    info = result[1]
+    records = result[2:]
+
+    keys = [i[0] for i in info]
+    types = [i[1] for i in info]
+    return hits, ResultSet(keys, records, types)
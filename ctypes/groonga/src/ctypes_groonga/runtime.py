@@ -0,0 +1,66 @@
+"""Process-wide runtime module."""
+
+import atexit
+import threading
+from ctypes import cdll
+from pathlib import Path
+from typing import Any
+
+from . import library
+
+
+class Runtime:
+    """Library initialized once in process.
+
+    `grn_init` is called at the first acquisition and `grn_fin` is called
+    at the last release or at interpreter exit. The query logger set to
+    library is held until `grn_fin` because it is shared by all instances.
+    """
+
+    def __init__(self, lib: library.Library) -> None:
+        """Initialize."""
+        self.lib = lib
+        self.refcount = 0
+        self.query_logger: Any = None
+
+
+_lock = threading.Lock()
+_runtimes: dict[str, Runtime] = {}
+
+
+def acquire(path: Path | None, prototypes: dict[str, library.Prototype]) -> Runtime:
+    """Get runtime of library and increment reference count."""
+    name = str(library.find(path))
+
+    with _lock:
+        runtime = _runtimes.get(name)
+        if runtime is None:
+            lib = library.Library(cdll.LoadLibrary(name), prototypes)
+            runtime = _runtimes[name] = Runtime(lib)
+
+        if runtime.refcount == 0:
+            runtime.lib.grn_init()
+        runtime.refcount += 1
+        return runtime
+
+
+def release(runtime: Runtime) -> None:
+    """Decrement reference count and finalize library at last."""
+    with _lock:
+        if runtime.refcount == 0:
+            raise Exception("grn_fin() of finalized runtime")
+
+        runtime.refcount -= 1
+        if runtime.refcount == 0:
+            runtime.lib.grn_fin()
+            runtime.query_logger = None
+
+
+@atexit.register
+def _fin() -> None:
+    with _lock:
+        for runtime in _runtimes.values():
+            if 0 < runtime.refcount:
+                runtime.refcount = 0
+                runtime.lib.grn_fin()
+                runtime.query_logger = None
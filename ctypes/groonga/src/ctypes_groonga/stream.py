@@ -0,0 +1,116 @@
+"""Streaming response module."""
+
+import codecs
+import json
+from collections.abc import Iterator
+from typing import Any
+
+from . import error
+from .resultset import Row, row_class
+
+_whitespace = " \t\r\n"
+
+
+class SelectStream:
+    """Rows of select response decoded one at a time.
+
+    The response is read from `data` by `chunk_size` bytes, and at most
+    `max_buffer` characters of undecoded text are held. When `data` is the view
+    returned by `Context.recv_raw(copy=False)`, rows must be consumed before
+    next command is sent.
+    """
+
+    def __init__(
+        self,
+        data: memoryview | bytes,
+        encoding: str = "utf-8",
+        chunk_size: int = 64 * 1024,
+        max_buffer: int = 16 * 1024 * 1024,
+    ) -> None:
+        """Initialize and decode hits and columns."""
+        self.chunk_size = chunk_size
+        self.max_buffer = max_buffer
+        self._data = data
+        self._offset = 0
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._done = False
+
+        # [[[hits], [[name, type], ...], row, ...], drilldown, ...]
+        self._expect("[")
+        self._expect("[")
+        self.hits = int(self._value()[0])
+        self._expect(",")
+        info = self._value()
+        self.keys: list[str] = [i[0] for i in info]
+        self.types: list[str] = [i[1] for i in info]
+        self._row_class = row_class(tuple(self.keys))
+
+    def __iter__(self) -> Iterator[Row]:
+        """Iterate rows."""
+        while not self._done:
+            if self._peek() == "]":
+                self._pos += 1
+                self._done = True
+                break
+
+            self._expect(",")
+            yield self._row_class(self._value())
+
+    def _compact(self) -> None:
+        if self.chunk_size <= self._pos:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+
+    def _expect(self, token: str) -> None:
+        if self._peek() != token:
+            raise error.GroongaError(f"Unexpected response: expected {token!r}")
+        self._pos += 1
+
+    def _fill(self, size: int = 0) -> bool:
+        if len(self._data) <= self._offset:
+            return False
+
+        pending = len(self._buffer) - self._pos
+        if self.max_buffer < pending:
+            raise error.ResponseTooLargeError(f"Row exceeds {self.max_buffer} characters")
+
+        # Read at least `size` but keep undecoded text within max_buffer.
+        size = max(self.chunk_size, min(size, self.max_buffer - pending))
+        end = self._offset + size
+        chunk = bytes(self._data[self._offset : end])
+        self._offset += len(chunk)
+        final = len(self._data) <= self._offset
+        self._buffer += self._decoder.decode(chunk, final)
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            size = len(self._buffer)
+            while self._pos < size and self._buffer[self._pos] in _whitespace:
+                self._pos += 1
+
+            if self._pos < size:
+                return self._buffer[self._pos]
+
+            self._compact()
+            if not self._fill():
+                return ""
+
+    def _value(self) -> Any:  # noqa: ANN401
+        # Only arrays are decoded, so a value cut at the end of buffer is
+        # always incomplete. Undecoded text is doubled before retry, so a
+        # large value is decoded a logarithmic number of times.
+        self._peek()
+        while True:
+            try:
+                value, self._pos = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                pending = len(self._buffer) - self._pos
+                self._compact()
+                if not self._fill(pending):
+                    raise
+            else:
+                return value
@@ -1,12 +1,23 @@
 """Database table module."""
 
+from __future__ import annotations
+
 import json
-from typing import Any, cast
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING, Any, cast
 
-from . import error, util
+from . import catalog, error, native, util
 from .column import Column
 from .groonga import Context
-from .record import Record
+from .loader import BulkLoader
+from .prepared import PreparedSelect
+from .resultset import ResultSet, Row, parse_select
+from .stream import SelectStream
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    import pandas as pd
 
 _column_create_param_keys: set[str] = set(
     [
@@ -51,11 +62,25 @@ _table_create_param_keys: set[str] = set(
 class Table:
     """Database table."""
 
-    def __init__(self, ctx: Context, **kwargs: Any) -> None:  # noqa: ANN401
-        """Initialize."""
+    def __init__(
+        self,
+        ctx: Context,
+        columns: list[dict[str, Any]] | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """Initialize.
+
+        If `columns` is None, columns are got from catalog or database.
+        """
         self.ctx = ctx
         self.__dict__.update(kwargs)
-        self.columns = self.list_columns()
+
+        if columns is None:
+            columns = ctx.catalog.columns(self.name)  # type: ignore[attr-defined]
+        if columns is None:
+            self.columns = self.list_columns()
+        else:
+            self.columns = [Column(**c) for c in columns]
 
     @property
     def count(self) -> int:
@@ -63,11 +88,18 @@ class Table:
         num, _ = self.select(limit=0)
         return num
 
+    def bulk_loader(
+        self,
+        max_records: int = 1000,
+        max_bytes: int = 1024 * 1024,
+        max_age: float | None = None,
+    ) -> BulkLoader:
+        """Create buffered loader."""
+        return BulkLoader(self, max_records, max_bytes, max_age)
+
     def clear(self) -> None:
         """Delete all records."""
-        _, records = self.select(limit=self.count)
-        for r in records:
-            self.delete(id=r.id)  # type: ignore[attr-defined]
+        self.truncate()
 
     def delete(self, **kwargs: Any) -> bool:  # noqa: ANN401
         """Delete matching records."""
@@ -79,13 +111,46 @@ class Table:
         self.ctx.send(cmd)
         return cast(bool, self.ctx.recv())
 
+    def delete_where(self, filter: str) -> int:  # noqa: A002
+        """Delete records matching filter and return number of deleted records.
+
+        The number is the difference of record counts before and after delete,
+        so records changed by another context meanwhile are counted as well.
+        """
+        before = self.count
+        if before == 0:
+            return 0
+
+        self.delete(filter=filter)
+        return before - self.count
+
+    def insert_many(
+        self,
+        rows: Iterable[Sequence[Any]],
+        columns: list[str] | None = None,
+    ) -> tuple[int, list[tuple[int, str]]]:
+        """Insert rows through C API without command.
+
+        Return number of inserted rows and pairs of row index and error.
+        If `columns` is None, rows are in the order of columns except indexes.
+        """
+        if columns is None:
+            columns = [c.name for c in self.columns if c.type != "index"]  # type: ignore[attr-defined]
+
+        return native.insert(self.ctx, self.name, columns, rows)  # type: ignore[attr-defined]
+
     def load(self, **kwargs: Any) -> int:  # noqa: ANN401
-        """Insert records."""
+        """Insert records.
+
+        `values` is a list of records or serialized JSON string.
+        """
         values = kwargs.get("values", None)
+        if not isinstance(values, str):
+            values = json.dumps(values)
 
         base_opt = {
             "table": self.name,  # type: ignore[attr-defined]
-            "values": json.dumps(values),
+            "values": values,
         }
         opt = kwargs | base_opt
 
@@ -95,14 +160,70 @@ class Table:
         self.ctx.send(cmd)
         return cast(int, self.ctx.recv())
 
-    def select(self, **kwargs: Any) -> tuple[int, list[Record]]:  # noqa: ANN401
-        """Get matching records."""
-        limit = kwargs.get("limit", -1)
-        if limit == -1:
-            limit = self.count
+    def load_dataframe(self, data: pd.DataFrame | pa.Table, chunk_rows: int = 10000) -> int:
+        """Insert records from pandas DataFrame or Apache Arrow table by chunk."""
+        from . import dataframe  # noqa: PLC0415
 
+        dataframe.validate(dataframe.dtypes(data), self.columns)
+
+        num = 0
+        for chunk in dataframe.chunks(data, chunk_rows):
+            num += self.load(values=dataframe.encode(chunk))
+
+        return num
+
+    def prepare_select(self, **kwargs: Any) -> PreparedSelect:  # noqa: ANN401
+        """Create select command with static options."""
+        opt = kwargs | {"table": self.name}  # type: ignore[attr-defined]
+        return PreparedSelect(self.ctx, **opt)
+
+    def scan(
+        self,
+        columns: list[str] | None = None,
+        offset: int = 0,
+        limit: int = -1,
+    ) -> Iterator[Row]:
+        """Iterate records in id order through C API without command.
+
+        If `columns` is None, `_id` and all columns except indexes are read.
+        """
+        if columns is None:
+            names = [c.name for c in self.columns if c.type != "index"]  # type: ignore[attr-defined]
+            columns = ["_id", *names]
+
+        return native.scan(self.ctx, self.name, columns, offset, limit)  # type: ignore[attr-defined]
+
+    def search(
+        self,
+        query: str,
+        match_columns: str,
+        output_columns: list[str] | None = None,
+        offset: int = 0,
+        limit: int = 10,
+    ) -> tuple[int, ResultSet]:
+        """Get records matching query in descending order of score through C API.
+
+        If `output_columns` is None, `_id` and all columns except indexes are returned.
+        If `limit` is -1, all matching records are returned.
+        """
+        if output_columns is None:
+            names = [c.name for c in self.columns if c.type != "index"]  # type: ignore[attr-defined]
+            output_columns = ["_id", *names]
+
+        return native.search(
+            self.ctx,
+            self.name,  # type: ignore[attr-defined]
+            query,
+            match_columns,
+            output_columns,
+            offset=offset,
+            limit=limit,
+        )
+
+    def select(self, **kwargs: Any) -> tuple[int, ResultSet]:  # noqa: ANN401
+        """Get matching records."""
         base_opt = {
-            "limit": limit,
+            "limit": kwargs.get("limit", -1),
             "table": self.name,  # type: ignore[attr-defined]
         }
         opt = kwargs | base_opt
@@ -111,17 +232,99 @@ class Table:
 
         self.ctx.send(cmd)
         ret = cast(list, self.ctx.recv())
+        return parse_select(ret)
+
+    def select_stream(
+        self,
+        chunk_size: int = 64 * 1024,
+        max_buffer: int = 16 * 1024 * 1024,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> SelectStream:
+        """Get matching records decoded one at a time.
+
+        Rows are decoded from the buffer of grn_ctx without copying whole
+        response, so they must be consumed before next command is sent.
+        """
+        base_opt = {
+            "limit": kwargs.get("limit", -1),
+            "table": self.name,  # type: ignore[attr-defined]
+        }
+        opt = kwargs | base_opt
+
+        cmd = f"select {util.create_cmd(opt)}"
 
-        result = ret[0]
-        hits = result[0][0]
-        info = result[1]
-        records = result[2:]
+        self.ctx.send(cmd)
+        data = self.ctx.recv_raw(copy=False)
+        return SelectStream(data, self.ctx.encoding, chunk_size, max_buffer)
+
+    def select_arrow(self, **kwargs: Any) -> pa.Table:  # noqa: ANN401
+        """Get matching records as Apache Arrow table.
 
-        if not records:
-            return hits, []
+        If database does not support Apache Arrow output, records are got in JSON.
+        """
+        from . import arrow  # noqa: PLC0415
+
+        base_opt = {
+            "limit": kwargs.get("limit", -1),
+            "output_type": "apache-arrow",
+            "table": self.name,  # type: ignore[attr-defined]
+        }
+        opt = kwargs | base_opt
 
-        keys = [i[0] for i in info]
-        return hits, [Record(**r._asdict()) for r in util.mknamedtuple("Record", keys, records)]
+        cmd = f"select {util.create_cmd(opt)}"
+
+        try:
+            self.ctx.send(cmd)
+            raw = self.ctx.recv_raw()
+        except error.GroongaError:
+            # discard output of failed command.
+            self.ctx.recv_raw(copy=False)
+            raw = b""
+
+        if arrow.is_arrow(raw):
+            return arrow.read_table(raw)
+
+        if raw:
+            # unknown output type is answered in JSON.
+            _, records = parse_select(json.loads(raw.decode(self.ctx.encoding)))
+        else:
+            _, records = self.select(**kwargs)
+        return arrow.from_records(records)
+
+    def select_columns(self, fixed_width: bool = False, **kwargs: Any) -> dict[str, Any]:  # noqa: ANN401
+        """Get matching records as NumPy array per column.
+
+        If `fixed_width` is true, text columns are fixed-width string array.
+        """
+        from . import columnar  # noqa: PLC0415
+
+        _, records = self.select(**kwargs)
+        return columnar.to_arrays(records, self._column_types(records), fixed_width)
+
+    def select_dataframe(self, **kwargs: Any) -> pd.DataFrame:  # noqa: ANN401
+        """Get matching records as pandas DataFrame."""
+        return self.select_arrow(**kwargs).to_pandas()
+
+    def iter_select(self, page_size: int = 1000, **kwargs: Any) -> Iterator[Row]:  # noqa: ANN401
+        """Get matching records page by page."""
+        pages = util.Pages(page_size, int(kwargs.pop("offset", 0)), int(kwargs.pop("limit", -1)))
+        while not pages.done:
+            hits, records = self.select(offset=pages.offset, limit=pages.size, **kwargs)
+            yield from records
+            pages.advance(hits, len(records))
+
+    def truncate(self) -> int:
+        """Delete all records at once and return number of deleted records."""
+        num = self.count
+        if num == 0:
+            return 0
+
+        opt = {"target_name": self.name}  # type: ignore[attr-defined]
+        cmd = f"truncate {util.create_cmd(opt)}"
+
+        self.ctx.send(cmd)
+        self.ctx.recv()
+        return num
 
     def create_column(self, **kwargs: str) -> Column:
         """Create and add column to table."""
@@ -133,32 +336,38 @@ class Table:
 
         name = kwargs.get("name", None)
 
-        columns = self.list_columns()
-        if columns is None:
+        columns = catalog.list_columns(self.ctx, self.name)  # type: ignore[attr-defined]
+        attrs = [c for c in columns if c["name"] == name]
+        if len(attrs) != 1:
             raise error.ColumnNotFoundError(name)
 
-        column = [c for c in columns if c.name == name]  # type: ignore[attr-defined]
-        if len(column) != 1:
-            raise error.ColumnNotFoundError(name)
+        self.ctx.catalog.add_column(self.name, attrs[0])  # type: ignore[attr-defined]
 
-        self.columns.append(column[0])
-        return column[0]
+        column = Column(**attrs[0])
+        self.columns.append(column)
+        return column
 
     def list_columns(self) -> list[Column]:
         """List columns in table."""
-        cmd = f"column_list --table {self.name}"  # type: ignore[attr-defined]
-
-        self.ctx.send(cmd)
-        ret = cast(list, self.ctx.recv())
+        return [Column(**c) for c in catalog.list_columns(self.ctx, self.name)]  # type: ignore[attr-defined]
 
-        info = ret[0]
-        columns = ret[1:]
+    def _column_types(self, records: ResultSet) -> list[str | None]:
+        columns = {c.name: c for c in self.columns}  # type: ignore[attr-defined]
+        types: list[str | None] = [None] * len(records.keys)
+        if records.types is not None:
+            types = list(records.types)
 
-        if not columns:
-            return []
+        column_types: list[str | None] = []
+        for key, type_name in zip(records.keys, types, strict=True):
+            column = columns.get(key)
+            if column is None:
+                column_types.append(type_name)
+            elif "COLUMN_VECTOR" in column.flags:  # type: ignore[attr-defined]
+                column_types.append(None)
+            else:
+                column_types.append(column.range)  # type: ignore[attr-defined]
 
-        keys = [i[0] for i in info]
-        return [Column(**c._asdict()) for c in util.mknamedtuple("Column", keys, columns)]
+        return column_types
 
 
 def create_table(ctx: Context, **kwargs: str) -> Table:
@@ -171,29 +380,15 @@ def create_table(ctx: Context, **kwargs: str) -> Table:
 
     name = kwargs.get("name", None)
 
-    tables = list_tables(ctx)
-    if tables is None:
-        raise error.TableNotFoundError(name)
-
-    table = [t for t in tables if t.name == name]  # type: ignore[attr-defined]
-    if len(table) != 1:
+    tables = [t for t in catalog.list_tables(ctx) if t["name"] == name]
+    if len(tables) != 1:
         raise error.TableNotFoundError(name)
 
-    return table[0]
+    columns = catalog.list_columns(ctx, tables[0]["name"])
+    ctx.catalog.add_table(tables[0], columns)
+    return Table(ctx, columns, **tables[0])
 
 
 def list_tables(ctx: Context) -> list[Table]:
     """List tables in database."""
-    cmd = "table_list"
-
-    ctx.send(cmd)
-    ret = cast(list, ctx.recv())
-
-    info = ret[0]
-    tables = ret[1:]
-
-    if not tables:
-        return []
-
-    keys = [i[0] for i in info]
-    return [Table(ctx, **t._asdict()) for t in util.mknamedtuple("Table", keys, tables)]
+    return [Table(ctx, **t) for t in ctx.catalog.tables()]
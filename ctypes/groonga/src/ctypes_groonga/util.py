@@ -1,15 +1,85 @@
 """Utility module."""
 
+import re
 from collections import namedtuple
+from functools import cache
 from typing import Any
 
+# Commands which do not change database.
+read_commands: set[bytes] = {
+    b"column_list",
+    b"dump",
+    b"object_exist",
+    b"object_inspect",
+    b"schema",
+    b"select",
+    b"status",
+    b"table_list",
+}
+
+# Commands which change records of one table.
+write_commands: set[bytes] = {
+    b"delete",
+    b"load",
+    b"truncate",
+}
+
+_command_pattern = re.compile(rb"\s*(\S+)")
+
+_escape_table = str.maketrans({"\\": "\\\\", "'": "\\'"})
+
+
+def command_name(cmd: bytes) -> bytes:
+    """Get command name."""
+    m = _command_pattern.match(cmd)
+    return b"" if m is None else m.group(1)
+
+
+class Pages:
+    """Offset and size of pages of select.
+
+    If `limit` is negative, pages continue until all records are got.
+    """
+
+    def __init__(self, page_size: int, offset: int = 0, limit: int = -1) -> None:
+        """Initialize."""
+        if page_size <= 0:
+            raise ValueError(f"page_size must be positive: {page_size}")
+
+        self.page_size = page_size
+        self.offset = offset
+        self.limit = limit
+        self.done = limit == 0
+
+    @property
+    def size(self) -> int:
+        """Get size of current page."""
+        return self.page_size if self.limit < 0 else min(self.page_size, self.limit)
+
+    def advance(self, hits: int, received: int) -> None:
+        """Move to next page after records of current page are received."""
+        size = self.size
+        self.offset += received
+        if self.limit > 0:
+            self.limit -= received
+
+        self.done = self.limit == 0 or received < size or hits <= self.offset
+
 
 def create_cmd(opt: dict[str, Any]) -> str:
     """Create command line."""
-    args = [f"--{k} '{_escape(str(v))}'" for k, v in opt.items()]
+    args = [f"--{k} '{escape(str(v))}'" for k, v in opt.items()]
     return " ".join(args)
 
 
+def escape(value: str) -> str:
+    """Escape option value."""
+    if "\\" not in value and "'" not in value:
+        return value
+
+    return value.translate(_escape_table)
+
+
 def filter_opt(params: set[str], **kwargs: str) -> dict[str, str]:
     """Filter keys."""
     keys = set(kwargs.keys()) & params
@@ -19,12 +89,18 @@ def filter_opt(params: set[str], **kwargs: str) -> dict[str, str]:
     return opt
 
 
+def is_schema_command(cmd: bytes) -> bool:
+    """Check command which may change schema."""
+    name = command_name(cmd)
+    return name not in read_commands and name not in write_commands
+
+
 def mknamedtuple(name: str, keys: list[str], values: list[list[Any]]) -> list:
     """Create named tuple."""
-    ks = [k.lstrip("_") for k in keys]
-    t = namedtuple(name, ks)  # type: ignore[misc] # noqa: PYI024
+    t = _namedtuple(name, tuple(k.lstrip("_") for k in keys))
     return [t(*v) for v in values]
 
 
-def _escape(value: str) -> str:
-    return value.replace("\\", "\\\\").replace("'", "\\'")
+@cache
+def _namedtuple(name: str, keys: tuple[str, ...]) -> type:
+    return namedtuple(name, keys)  # noqa: PYI024
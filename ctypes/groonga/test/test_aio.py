@@ -0,0 +1,45 @@
+import asyncio
+
+from ctypes_groonga import Groonga
+from ctypes_groonga.aio import AsyncContext, AsyncTable
+from ctypes_groonga.table import create_table
+
+from test import GroongaTestCase
+
+
+class TestAsync(GroongaTestCase):
+    def test_execute(self) -> None:
+        async def execute(g: Groonga) -> None:
+            async with AsyncContext(g, self.db_path, size=2) as c:
+                results = await asyncio.gather(*[c.execute("status") for _ in range(4)])
+                self.assertEqual(len(results), 4)
+
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path):
+                pass
+
+            asyncio.run(execute(g))
+
+    def test_table(self) -> None:
+        async def select(g: Groonga) -> None:
+            async with AsyncContext(g, self.db_path, size=2) as c:
+                t = AsyncTable(c, "Test")
+                n = await t.load(values=[{"_key": "a"}, {"_key": "b"}, {"_key": "c"}])
+                self.assertEqual(n, 3)
+                self.assertEqual(await t.count(), 3)
+
+                num, records = await t.select(query='_key:"b"')
+                self.assertEqual(num, 1)
+                self.assertEqual(records[0].key, "b")  # type: ignore[attr-defined]
+
+                keys = [r.key async for r in t.iter_select(page_size=2)]  # type: ignore[attr-defined]
+                self.assertEqual(keys, ["a", "b", "c"])
+
+                with self.assertRaises(ValueError):
+                    [r async for r in t.iter_select(page_size=0)]
+
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                create_table(c, name="Test", flags="TABLE_HASH_KEY", key_type="ShortText")
+
+            asyncio.run(select(g))
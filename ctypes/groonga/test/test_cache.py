@@ -0,0 +1,66 @@
+from ctypes_groonga import Groonga, QueryCache
+from ctypes_groonga.table import create_table
+
+from test import GroongaTestCase
+
+
+class TestQueryCache(GroongaTestCase):
+    def test_lru(self) -> None:
+        cache = QueryCache(max_entries=2)
+        cache.store(b"select --table 'A'", b"a")
+        cache.store(b"select --table 'B'", b"b")
+        self.assertEqual(cache.lookup(b"select --table 'A'"), b"a")
+
+        cache.store(b"select --table 'C'", b"c")
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.lookup(b"select --table 'B'"))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_invalidate(self) -> None:
+        cache = QueryCache()
+        cache.store(b"select --table 'A'", b"a")
+        cache.store(b"select --table 'B'", b"b")
+
+        cache.lookup(b"load --table 'A' --values '[]'")
+        self.assertIsNone(cache.lookup(b"select --table 'A'"))
+        self.assertEqual(cache.lookup(b"select --table 'B'"), b"b")
+
+        cache.lookup(b"column_create --table 'B' --name 'name'")
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+    def test_invalidate_values(self) -> None:
+        cache = QueryCache()
+        cache.store(b"select --table 'A'", b"a")
+        cache.store(b"select --table 'B'", b"b")
+
+        cache.lookup(b"load --values '[{\"text\": \"--table \\'B\\'\"}]' --table 'A'")
+        self.assertIsNone(cache.lookup(b"select --table 'A'"))
+        self.assertEqual(cache.lookup(b"select --table 'B'"), b"b")
+
+        cache.lookup(b"load --values '[]'")
+        self.assertEqual(len(cache), 0)
+
+    def test_ttl(self) -> None:
+        cache = QueryCache(ttl=0)
+        cache.store(b"select --table 'A'", b"a")
+        self.assertIsNone(cache.lookup(b"select --table 'A'"))
+
+    def test_context(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = create_table(c, name="Test", flags="TABLE_HASH_KEY", key_type="ShortText")
+                cache = c.enable_cache()
+
+                t.load(values=[{"_key": "a"}])
+                n, _ = t.select()
+                self.assertEqual(n, 1)
+                n, _ = t.select()
+                self.assertEqual(n, 1)
+                self.assertEqual(cache.hits, 1)
+
+                t.load(values=[{"_key": "b"}])
+                n, _ = t.select()
+                self.assertEqual(n, 2)
+                self.assertEqual(cache.hits, 1)
@@ -0,0 +1,34 @@
+import unittest
+from importlib.util import find_spec
+
+from ctypes_groonga import Groonga
+from ctypes_groonga.table import create_table
+
+from test import GroongaTestCase
+
+
+@unittest.skipUnless(find_spec("numpy"), "numpy is not installed")
+class TestColumnar(GroongaTestCase):
+    def test_select_columns(self) -> None:
+        import numpy as np  # noqa: PLC0415
+
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = create_table(c, name="Test", flags="TABLE_HASH_KEY", key_type="ShortText")
+                t.create_column(name="name", type="ShortText")
+                t.create_column(name="size", type="UInt16")
+
+                values = [
+                    {"_key": "a", "name": "A", "size": 1},
+                    {"_key": "b", "name": "B", "size": 2},
+                ]
+                t.load(values=values)
+
+                columns = t.select_columns(output_columns="_id,name,size")
+                self.assertEqual(columns["_id"].dtype, np.uint32)
+                self.assertEqual(columns["name"].dtype, object)
+                self.assertEqual(columns["size"].dtype, np.uint16)
+                self.assertEqual(columns["size"].tolist(), [1, 2])
+
+                columns = t.select_columns(fixed_width=True, output_columns="name")
+                self.assertEqual(columns["name"].tolist(), ["A", "B"])
@@ -0,0 +1,53 @@
+import unittest
+from importlib.util import find_spec
+
+from ctypes_groonga import Groonga, error
+from ctypes_groonga.table import create_table
+
+from test import GroongaTestCase
+
+
+@unittest.skipUnless(
+    find_spec("pandas") and find_spec("pyarrow"), "pandas or pyarrow is not installed"
+)
+class TestDataFrame(GroongaTestCase):
+    def test_load_dataframe(self) -> None:
+        import pandas as pd  # noqa: PLC0415
+
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = create_table(c, name="Test", flags="TABLE_HASH_KEY", key_type="ShortText")
+                t.create_column(name="name", type="ShortText")
+                t.create_column(name="size", type="UInt16")
+
+                df = pd.DataFrame(self._create_loaddata())
+                df["size"] = range(len(df))
+
+                n = t.load_dataframe(df, chunk_rows=3)
+                self.assertEqual(n, len(df))
+                self.assertEqual(t.count, len(df))
+
+                with self.assertRaises(error.ColumnTypeError):
+                    t.load_dataframe(pd.DataFrame({"size": ["a"]}))
+
+                with self.assertRaises(error.ColumnNotFoundError):
+                    t.load_dataframe(pd.DataFrame({"unknown": [1]}))
+
+    def test_select_arrow_dataframe(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = create_table(c, name="Test", flags="TABLE_HASH_KEY", key_type="ShortText")
+                t.create_column(name="name", type="ShortText")
+
+                values = self._create_loaddata()
+                t.load(values=values)
+
+                table = t.select_arrow(output_columns="_key,name")
+                self.assertEqual(table.num_rows, len(values))
+                self.assertEqual(table.column_names, ["_key", "name"])
+
+                df = t.select_dataframe(output_columns="name")
+                self.assertEqual(df["name"].tolist(), [v["name"] for v in values])
+
+    def _create_loaddata(self) -> list[dict[str, str]]:
+        return [{"_key": k, "name": k.upper()} for k in ("a", "aa", "aaa", "aaaa")]
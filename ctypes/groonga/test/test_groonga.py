@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 from ctypes_groonga import Groonga, error
@@ -60,11 +61,34 @@ class TestGroonga(GroongaTestCase):
                 d = c.recv()
                 self.assertIsNotNone(d)
 
+    def test_send_recv_raw(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(None) as c:
+                c.send(b"status")
+                raw = c.recv_raw()
+                self.assertIsInstance(raw, bytes)
+                self.assertIn("version", json.loads(raw))
+
+                c.send("status")
+                view = c.recv_raw(copy=False)
+                self.assertIsInstance(view, memoryview)
+                self.assertIn("version", json.loads(view.tobytes()))
+
     def test_grn_fin_twice(self) -> None:
         with self.assertRaisesRegex(Exception, "grn_fin"):
             with Groonga(self.lib_path) as g:
                 g.fin()
 
+    def test_shared_runtime(self) -> None:
+        with Groonga(self.lib_path) as g1:
+            g2 = Groonga(self.lib_path)
+            self.assertIs(g1(), g2())
+
+            g2.fin()
+            with g1.create_ctx(None) as c:
+                c.send("status")
+                self.assertIsNotNone(c.recv())
+
     def test_ctx_create_not_exist(self) -> None:
         with Groonga(self.lib_path) as g:
             with self.assertRaisesRegex(Exception, "grn_db_create"):
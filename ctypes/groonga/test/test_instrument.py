@@ -0,0 +1,50 @@
+from ctypes_groonga import Groonga, Instrumentation, error
+from ctypes_groonga.instrument import Histogram, Sample
+from ctypes_groonga.table import create_table
+
+from test import GroongaTestCase
+
+
+class TestInstrumentation(GroongaTestCase):
+    def test_histogram(self) -> None:
+        h = Histogram()
+        for ns in (500, 1500, 3000, 100000):
+            h.observe(ns)
+
+        self.assertEqual(h.count, 4)
+        self.assertEqual(h.total_ns, 105000)
+        self.assertEqual(h.percentile(25), 1.0)
+        self.assertEqual(h.percentile(50), 2.0)
+        self.assertEqual(h.percentile(100), 128.0)
+
+    def test_hooks(self) -> None:
+        samples: list[Sample] = []
+
+        inst = Instrumentation()
+        inst.add_hook(samples.append)
+        inst.begin("status").bytes_sent = 6
+        inst.begin("select")
+        inst.end("error")
+
+        self.assertEqual([s.command for s in samples], ["status", "select"])
+        self.assertEqual(inst.commands["status"].bytes_sent, 6)
+        self.assertEqual(inst.commands["select"].errors, 1)
+        self.assertIsNone(inst.current())
+
+    def test_context(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = create_table(c, name="Test", flags="TABLE_HASH_KEY", key_type="ShortText")
+                inst = c.enable_instrumentation()
+
+                t.load(values=[{"_key": "a"}])
+                t.select()
+                with self.assertRaises(error.GroongaError):
+                    c.send("select --table Unknown")
+
+                stats = inst.snapshot()
+                self.assertEqual(stats["load"]["count"], 1)
+                self.assertEqual(stats["select"]["count"], 2)
+                self.assertEqual(stats["select"]["errors"], 1)
+                self.assertLess(0, stats["select"]["bytes_received"])
+                self.assertEqual(inst.commands["select"].latency["parse"].count, 2)
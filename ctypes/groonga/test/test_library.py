@@ -0,0 +1,48 @@
+import os
+from ctypes import CDLL, c_char_p, c_size_t
+from pathlib import Path
+from unittest import mock
+
+from ctypes_groonga import library
+
+from test import GroongaTestCase
+
+
+class TestLibrary(GroongaTestCase):
+    def test_lazy_prototype(self) -> None:
+        lib = library.Library(CDLL(None), {"strlen": (c_size_t, [c_char_p], None)})
+        self.assertNotIn("strlen", vars(lib))
+
+        self.assertEqual(lib.strlen(b"abc"), 3)
+        self.assertEqual(lib.strlen.argtypes, [c_char_p])
+        self.assertIn("strlen", vars(lib))
+
+    def test_find_env(self) -> None:
+        with mock.patch.dict(os.environ, {library.LIBRARY_ENV: "/a/libgroonga.so"}):
+            self.assertEqual(library.find(), Path("/a/libgroonga.so"))
+            self.assertEqual(library.find(Path("/b")), Path("/b"))
+
+    def test_find_cache(self) -> None:
+        lib_path = self.db_base / "libgroonga.so"
+        lib_path.touch()
+
+        env = {"XDG_CACHE_HOME": str(self.db_base)}
+        with mock.patch.dict(os.environ, env):
+            os.environ.pop(library.LIBRARY_ENV, None)
+            with mock.patch.object(library, "find_library", return_value=str(lib_path)) as m:
+                self.assertEqual(library.find(), lib_path)
+                self.assertEqual(library.find(), lib_path)
+                self.assertEqual(m.call_count, 1)
+
+            self.assertEqual(library.cache_path().read_text(), str(lib_path))
+
+    def test_find_cache_soname(self) -> None:
+        env = {"XDG_CACHE_HOME": str(self.db_base)}
+        with mock.patch.dict(os.environ, env):
+            os.environ.pop(library.LIBRARY_ENV, None)
+            with mock.patch.object(library, "find_library", return_value="libgroonga.so.0") as m:
+                self.assertEqual(library.find(), Path("libgroonga.so.0"))
+                self.assertEqual(library.find(), Path("libgroonga.so.0"))
+                self.assertEqual(m.call_count, 1)
+
+            self.assertEqual(library.cache_path().read_text(), "libgroonga.so.0")
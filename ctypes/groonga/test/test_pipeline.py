@@ -0,0 +1,44 @@
+from ctypes_groonga import Groonga, error
+from ctypes_groonga.table import list_tables
+
+from test import GroongaTestCase
+
+
+class TestPipeline(GroongaTestCase):
+    def test_execute(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                p = c.pipeline()
+                p.add("table_create", name="Test", flags="TABLE_HASH_KEY", key_type="ShortText")
+                p.add("column_create", table="Test", name="name", type="ShortText")
+                p.add("unknown")
+                p.add_raw("status", quiet=True)
+                p.add("select", table="Test")
+                self.assertEqual(len(p), 5)
+
+                results = p.execute()
+                self.assertEqual(len(p), 0)
+                self.assertEqual([r.ok for r in results], [True, True, False, True, True])
+                self.assertTrue(results[0].value)
+                self.assertIn("unknown", results[2].error or "")
+                self.assertIsNone(results[3].value)
+                self.assertEqual(results[4].value[0][0], [0])
+
+                tables = list_tables(c)
+                self.assertEqual([t.name for t in tables], ["Test"])  # type: ignore[attr-defined]
+                self.assertEqual(
+                    [col.name for col in tables[0].columns],  # type: ignore[attr-defined]
+                    ["_key", "name"],
+                )
+
+    def test_context(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                with self.assertRaises(error.PipelineError) as cm:
+                    with c.pipeline() as p:
+                        p.add("unknown")
+                        p.add("table_create", name="Test")
+
+                self.assertEqual([i for i, _ in cm.exception.errors], [0])
+                self.assertEqual(p.results[1].value, None)
+                self.assertEqual(list_tables(c), [])
@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from ctypes_groonga import ContextPool, Groonga, error
+
+from test import GroongaTestCase
+
+
+class TestContextPool(GroongaTestCase):
+    def test_acquire(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path):
+                pass
+
+            with ContextPool(g, self.db_path, size=2) as pool:
+                with pool.acquire() as c1, pool.acquire() as c2:
+                    self.assertIsNot(c1, c2)
+
+                    with self.assertRaises(TimeoutError):
+                        with pool.acquire(timeout=0.01):
+                            pass
+
+                self.assertEqual(pool.stats["busy"], 0)
+                self.assertEqual(pool.stats["wait_count"], 2)
+
+    def test_acquire_concurrent(self) -> None:
+        def status(pool: ContextPool) -> object:
+            with pool.acquire() as c:
+                c.send("status")
+                return c.recv()
+
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path):
+                pass
+
+            with ContextPool(g, self.db_path, size=2) as pool:
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    results = list(executor.map(status, [pool] * 8))
+
+                self.assertEqual(len(results), 8)
+                self.assertEqual(pool.stats["wait_count"], 8)
+
+    def test_recycle(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path):
+                pass
+
+            with ContextPool(g, self.db_path, size=1) as pool:
+                with self.assertRaises(error.GroongaError):
+                    with pool.acquire() as c:
+                        c.send("unknown")
+
+                self.assertEqual(pool.stats["recycled"], 1)
+
+                with pool.acquire() as c:
+                    c.send("status")
+                    self.assertIsNotNone(c.recv())
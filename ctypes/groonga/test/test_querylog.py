@@ -0,0 +1,54 @@
+from ctypes_groonga import Groonga, QueryLogCollector
+from ctypes_groonga.querylog import parse, report
+from ctypes_groonga.table import create_table
+
+from test import GroongaTestCase
+
+_log = """\
+2011-07-05 06:25:19.458756|0x7fff5f43ac00|>select Shops --filter true
+2011-07-05 06:25:19.458829|0x7fff5f43ac00|:000000000072779 filter(1)
+2011-07-05 06:25:19.458875|0x7fff5f43ac00|:000000000119062 sort(1)
+2011-07-05 06:25:19.458986|0x7fff5f43ac00|:000000000229945 output(1)
+2011-07-05 06:25:19.459021|0x7fff5f43ac00|<000000000265239 rc=0
+2011-07-05 06:25:20.000000|0x7fff5f43ac00|>/d/status.json
+2011-07-05 06:25:20.000100|0x7fff5f43ac00|<000000000100000 rc=0
+2011-07-05 06:25:21.000000|0x7fff5f43ac00|>select Unknown
+2011-07-05 06:25:21.000100|0x7fff5f43ac00|<000000000050000 rc=-22
+"""
+
+
+class TestQueryLog(GroongaTestCase):
+    def test_parse(self) -> None:
+        entries = list(parse(_log.splitlines()))
+        self.assertEqual([e.name for e in entries], ["select", "status", "select"])
+        self.assertEqual(
+            entries[0].stages,
+            [("filter", 1, 72779), ("sort", 1, 46283), ("output", 1, 110883)],
+        )
+        self.assertEqual(entries[0].elapsed_ns, 265239)
+        self.assertEqual(entries[2].rc, -22)
+
+    def test_report(self) -> None:
+        r = report(parse(_log.splitlines()), top=2)
+        self.assertEqual(r["commands"]["select"]["count"], 2)
+        self.assertEqual(r["commands"]["select"]["errors"], 1)
+        self.assertAlmostEqual(r["commands"]["select"]["stages"]["filter"], 0.072779)
+        self.assertEqual(
+            [s["command"] for s in r["slow"]],
+            ["select Shops --filter true", "/d/status.json"],
+        )
+
+    def test_logger(self) -> None:
+        with Groonga(self.lib_path) as g:
+            collector = QueryLogCollector()
+            g.set_query_logger(collector)
+            try:
+                with g.create_ctx(self.db_path) as c:
+                    t = create_table(c, name="Test", flags="TABLE_HASH_KEY", key_type="ShortText")
+                    t.select()
+            finally:
+                g.set_query_logger(None)
+
+            names = [e.name for e in collector.entries]
+            self.assertIn("select", names)
+            self.assertEqual(collector.report()["commands"]["select"]["errors"], 0)
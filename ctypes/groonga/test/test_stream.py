@@ -0,0 +1,46 @@
+import json
+
+from ctypes_groonga import Groonga, SelectStream, error
+from ctypes_groonga.table import create_table
+
+from test import GroongaTestCase
+
+
+class TestSelectStream(GroongaTestCase):
+    def test_decode(self) -> None:
+        rows = [[i, f"キー{i}", [1, 2]] for i in range(1, 50)]
+        response = [
+            [[len(rows)], [["_id", "UInt32"], ["_key", "ShortText"], ["tags", "Int32"]], *rows],
+            [[0], []],
+        ]
+        data = json.dumps(response, ensure_ascii=False, indent=1).encode()
+
+        stream = SelectStream(memoryview(data), chunk_size=7)
+        self.assertEqual(stream.hits, len(rows))
+        self.assertEqual(stream.keys, ["_id", "_key", "tags"])
+        self.assertEqual(stream.types, ["UInt32", "ShortText", "Int32"])
+
+        records = list(stream)
+        self.assertEqual([r.key for r in records], [r[1] for r in rows])  # type: ignore[attr-defined]
+        self.assertEqual(records[0].tags, [1, 2])  # type: ignore[attr-defined]
+
+    def test_empty(self) -> None:
+        stream = SelectStream(b'[[[0],[["_id","UInt32"]]]]')
+        self.assertEqual(stream.hits, 0)
+        self.assertEqual(list(stream), [])
+
+    def test_max_buffer(self) -> None:
+        data = json.dumps([[[1], [["_key", "ShortText"]], ["a" * 1000]]]).encode()
+        stream = SelectStream(data, chunk_size=16, max_buffer=100)
+        with self.assertRaises(error.ResponseTooLargeError):
+            list(stream)
+
+    def test_table(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = create_table(c, name="Test", flags="TABLE_HASH_KEY", key_type="ShortText")
+                t.load(values=[{"_key": f"k{i}"} for i in range(100)])
+
+                stream = t.select_stream(chunk_size=64, output_columns="_key")
+                self.assertEqual(stream.hits, 100)
+                self.assertEqual([r.key for r in stream], [f"k{i}" for i in range(100)])  # type: ignore[attr-defined]
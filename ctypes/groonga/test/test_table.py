@@ -1,4 +1,4 @@
-from ctypes_groonga import Context, Groonga, Table
+from ctypes_groonga import Context, Groonga, ResultSet, Table, error
 from ctypes_groonga.table import create_table, list_tables
 
 from test import GroongaTestCase
@@ -17,6 +17,54 @@ class TestTable(GroongaTestCase):
                 table = self._create_table(c)
                 self.assertEqual(table.name, "Test")  # type: ignore[attr-defined]
 
+    def test_catalog(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                self._create_table(c)
+                self.assertFalse(c.catalog.stale)
+
+                tables = list_tables(c)
+                self.assertFalse(c.catalog.stale)
+                self.assertEqual([t.name for t in tables], ["Test"])  # type: ignore[attr-defined]
+                self.assertEqual(tables[0].columns[0].name, "_key")  # type: ignore[attr-defined]
+
+                tables[0].create_column(name="name", type="ShortText")
+                t = create_table(c, name="Other", flags="TABLE_NO_KEY")
+                self.assertFalse(c.catalog.stale)
+                self.assertEqual(len(t.columns), 0)
+
+                tables = list_tables(c)
+                self.assertEqual(len(tables), 2)
+                self.assertEqual(len(tables[0].columns), 2)
+
+                c.send("table_remove --name Other")
+                c.recv()
+                self.assertTrue(c.catalog.stale)
+                self.assertEqual(len(list_tables(c)), 1)
+
+            with g.open_ctx(self.db_path) as c:
+                self.assertTrue(c.catalog.stale)
+                t = create_table(c, name="Other", flags="TABLE_NO_KEY")
+                self.assertTrue(c.catalog.stale)
+                self.assertEqual(len(list_tables(c)), 2)
+
+    def test_create_attrs(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = self._create_table(c)
+                t.create_column(name="name", type="ShortText")
+                t.create_column(name="sizes", flags="COLUMN_VECTOR", type="UInt16")
+
+                created = sorted((vars(c) for c in t.columns), key=lambda c: c["name"])
+                listed = sorted((vars(c) for c in t.list_columns()), key=lambda c: c["name"])
+                self.assertEqual(created, listed)
+
+                tables = list_tables(c)
+                self.assertEqual(tables[0].id, t.id)  # type: ignore[attr-defined]
+                self.assertEqual(tables[0].path, t.path)  # type: ignore[attr-defined]
+                self.assertEqual(tables[0].flags, t.flags)  # type: ignore[attr-defined]
+                self.assertIsNotNone(tables[0].columns[1].path)  # type: ignore[attr-defined]
+
     def test_create_column(self) -> None:
         with Groonga(self.lib_path) as g:
             with g.create_ctx(self.db_path) as c:
@@ -89,6 +137,200 @@ class TestTable(GroongaTestCase):
                 self.assertEqual(n, 0)
                 self.assertSequenceEqual(records, [])
 
+    def test_select_resultset(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = self._create_table(c)
+                t.create_column(name="name", type="ShortText")
+                t.load(values=self._create_loaddata())
+
+                _, records = t.select(output_columns="_key,name")
+                self.assertIsInstance(records, ResultSet)
+                self.assertEqual(records.keys, ["_key", "name"])
+                self.assertIs(type(records[0]), type(records[1]))
+                self.assertEqual(records[0]._asdict(), {"key": "a", "name": "A"})
+
+    def test_prepare_select(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = self._create_table(c)
+                t.create_column(name="name", type="ShortText")
+                t.load(values=self._create_loaddata())
+
+                s = t.prepare_select(output_columns="_key,name")
+                for v in self._create_loaddata():
+                    n, records = s.execute(query=f'_key:"{v["_key"]}"')
+                    self.assertEqual(n, 1)
+                    self.assertEqual(records[0].name, v["name"])  # type: ignore[attr-defined]
+
+                n, records = s.execute()
+                self.assertEqual(len(records), 4)
+
+                n, records = s.execute(query="name:@A", limit=1)
+                self.assertEqual(len(records), 1)
+
+    def test_iter_select(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = self._create_table(c)
+                t.create_column(name="name", type="ShortText")
+
+                values = self._create_loaddata()
+                t.load(values=values)
+
+                records = list(t.iter_select(page_size=3))
+                self.assertEqual(len(records), len(values))
+                self.assertEqual(
+                    [r.name for r in records],  # type: ignore[attr-defined]
+                    [v["name"] for v in values],
+                )
+
+                records = list(t.iter_select(page_size=3, offset=1, limit=2))
+                self.assertEqual(len(records), 2)
+                self.assertEqual(records[0].name, "AA")  # type: ignore[attr-defined]
+
+                with self.assertRaises(ValueError):
+                    list(t.iter_select(page_size=0))
+
+    def test_scan(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = self._create_table(c)
+                t.create_column(name="name", type="ShortText")
+                t.create_column(name="size", type="Int32")
+                t.create_column(name="tags", type="ShortText", flags="COLUMN_VECTOR")
+
+                values = [
+                    {"size": i, "tags": [v["name"], v["_key"]]} | v
+                    for i, v in enumerate(self._create_loaddata())
+                ]
+                t.load(values=values)
+
+                records = list(t.scan())
+                self.assertEqual(len(records), len(values))
+                self.assertEqual(records[1].id, 2)  # type: ignore[attr-defined]
+                self.assertEqual(records[1].key, "aa")  # type: ignore[attr-defined]
+                self.assertEqual(records[1].name, "AA")  # type: ignore[attr-defined]
+                self.assertEqual(records[1].size, 1)  # type: ignore[attr-defined]
+                self.assertEqual(records[1].tags, ["AA", "aa"])  # type: ignore[attr-defined]
+
+                records = list(t.scan(columns=["name"], offset=1, limit=2))
+                self.assertEqual([r.name for r in records], ["AA", "AAA"])  # type: ignore[attr-defined]
+
+                with self.assertRaises(error.ColumnNotFoundError):
+                    list(t.scan(columns=["unknown"]))
+
+    def test_insert_many(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = self._create_table(c)
+                t.create_column(name="name", type="ShortText")
+                t.create_column(name="size", type="Int32")
+
+                rows = [
+                    ("a", "A", 1),
+                    ("aa", "AA", "x"),
+                    ("aaa", "AAA", None),
+                    ("aaaa",),
+                ]
+                n, errors = t.insert_many(rows)
+                self.assertEqual(n, 2)
+                self.assertEqual([i for i, _ in errors], [1, 3])
+                self.assertEqual(t.count, 3)
+
+                records = list(t.scan(columns=["_key", "name", "size"]))
+                self.assertEqual(records[0].size, 1)  # type: ignore[attr-defined]
+                self.assertEqual(records[2].name, "AAA")  # type: ignore[attr-defined]
+
+                n, errors = t.insert_many([("a", "B")], columns=["_key", "name"])
+                self.assertEqual(n, 1)
+                self.assertEqual(errors, [])
+                self.assertEqual(t.count, 3)
+
+    def test_search(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = self._create_table(c)
+                t.create_column(name="name", type="ShortText")
+                t.load(values=self._create_loaddata())
+
+                n, records = t.search("AA", match_columns="name", output_columns=["_key", "name"])
+                self.assertEqual(n, 3)
+                self.assertEqual(records.keys, ["_key", "name"])
+                self.assertEqual(
+                    sorted(r.name for r in records),  # type: ignore[attr-defined]
+                    ["AA", "AAA", "AAAA"],
+                )
+
+                n, records = t.search("AA", match_columns="name", limit=2)
+                self.assertEqual(n, 3)
+                self.assertEqual(len(records), 2)
+
+                n, records = t.search("AA", match_columns="name", limit=-1)
+                self.assertEqual(n, 3)
+                self.assertEqual(len(records), 3)
+
+                n, records = t.search("AA", match_columns="name", offset=3)
+                self.assertEqual(n, 3)
+                self.assertEqual(len(records), 0)
+
+                with self.assertRaises(error.GroongaError):
+                    t.search("AA", match_columns="unknown")
+
+    def test_truncate_delete_where(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = self._create_table(c)
+                t.create_column(name="name", type="ShortText")
+
+                values = self._create_loaddata()
+                t.load(values=values)
+
+                n = t.delete_where(filter='name == "AAA" || name == "AAAA"')
+                self.assertEqual(n, 2)
+                self.assertEqual(t.count, len(values) - 2)
+
+                n = t.delete_where(filter='name == "B"')
+                self.assertEqual(n, 0)
+
+                n = t.truncate()
+                self.assertEqual(n, len(values) - 2)
+                self.assertEqual(t.count, 0)
+
+    def test_bulk_loader(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = self._create_table(c)
+                t.create_column(name="name", type="ShortText")
+
+                values = self._create_loaddata()
+                with t.bulk_loader(max_records=3) as loader:
+                    for v in values:
+                        loader.add(v)
+                    self.assertEqual(loader.loaded, 3)
+
+                self.assertEqual(loader.loaded, len(values))
+                self.assertEqual(loader.errors, 0)
+                self.assertEqual(t.count, len(values))
+
+                with self.assertRaises(KeyError):
+                    with t.bulk_loader() as loader:
+                        loader.add({"_key": "b", "name": "B"})
+                        raise KeyError("b")
+                self.assertEqual(t.count, len(values))
+
+    def test_bulk_loader_max_bytes(self) -> None:
+        with Groonga(self.lib_path) as g:
+            with g.create_ctx(self.db_path) as c:
+                t = self._create_table(c)
+                t.create_column(name="name", type="ShortText")
+
+                # Non-ASCII characters take more than one byte in UTF-8.
+                value = '{"_key": "a", "name": "あいうえお"}'
+                with t.bulk_loader(max_bytes=len(value) + 1) as loader:
+                    loader.add_raw(value)
+                    self.assertEqual(loader.loaded, 1)
+
     def _create_loaddata(self) -> list[dict[str, str]]:
         return [
             {